@@ -1,35 +1,125 @@
 # analysis/backtest.py
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
+from quant.price_store import get_price_store
 
-def get_monthly_returns(tickers, start, end):
-    prices = yf.download(
-        tickers,
-        start=start,
-        end=end,
-        interval="1mo",
-        auto_adjust=True,
-        progress=False,
-    )["Close"]
-
-    returns = prices.pct_change().dropna()
+# one-way trading costs in basis points of traded notional, keyed by market
+MARKET_COSTS = {
+    "SGX": {"commission_bps": 8.0, "slippage_bps": 10.0},
+    "HKEX": {"commission_bps": 13.0, "slippage_bps": 10.0},  # includes 0.1% stamp duty
+    "NSE": {"commission_bps": 12.0, "slippage_bps": 8.0},    # includes securities transaction tax
+    "US": {"commission_bps": 1.0, "slippage_bps": 3.0},
+}
+
+MARKET_SUFFIXES = {"SI": "SGX", "HK": "HKEX", "NS": "NSE"}
+
+# resample rules for the supported bar intervals; daily bars are used as stored
+INTERVAL_RULES = {"1d": None, "1wk": "W-MON", "1mo": "MS"}
+
+def market_of(ticker):
+    suffix = ticker.rsplit(".", 1)[1] if "." in ticker else ""
+    return MARKET_SUFFIXES.get(suffix.upper(), "US")
+
+def cost_rates(tickers, cost_model=MARKET_COSTS):
+    # one-way cost per unit of traded weight for each ticker
+    return np.array([
+        (cost_model[market_of(t)]["commission_bps"] + cost_model[market_of(t)]["slippage_bps"]) / 10_000
+        for t in tickers
+    ])
+
+def get_returns(tickers, start, end, interval="1mo"):
+    # bars resampled from the cached daily closes; "1mo" is labelled by month start like yfinance
+    daily = get_price_store().load(tickers, start, end)["Close"]
+    rule = INTERVAL_RULES[interval]
+    prices = daily.resample(rule).last() if rule else daily
+    prices = prices.reindex(columns=tickers)
+
+    returns = prices.pct_change().dropna(how="all")
     return returns
 
+def get_monthly_returns(tickers, start, end):
+    return get_returns(tickers, start, end, interval="1mo")
 
-def run_backtest(df, start="2021-01-01", end="2024-01-01"):
-    tickers = df["Ticker"].tolist()
+def rebalance_flags(index, rebalance):
+    """
+    Marks the periods on which the book is traded back to target.
+    `rebalance` is an int (every n periods), a pandas period frequency such
+    as "Q" or "Y" (first period of each new bucket) or None (buy and hold).
+    """
+    flags = np.zeros(len(index), dtype=bool)
+    if len(index) == 0:
+        return flags
 
-    monthly_returns = get_monthly_returns(tickers, start, end)
+    if rebalance is None:
+        pass
+    elif isinstance(rebalance, int):
+        flags[::rebalance] = True
+    else:
+        buckets = index.to_period(rebalance)
+        flags[1:] = buckets[1:] != buckets[:-1]
 
-    # align columns
-    monthly_returns = monthly_returns[tickers]
+    flags[0] = True
+    return flags
 
-    portfolio_returns = []
+def backtest_weights(returns, weights, rebalance=1, cost_model=None):
+    """
+    Simulates a book traded to `weights` on each rebalance period and left to
+    drift in between. `weights` is a ticker-indexed Series (one static target)
+    or a date x ticker frame of targets (the latest row at or before each
+    rebalance is used). Uninvested weight is held as cash at zero return.
+    With `cost_model` set, each rebalance pays commission plus slippage on
+    the traded weight, including the initial purchase from cash.
+    Returns the per-period portfolio return series.
+    """
+    tickers = list(returns.columns)
+    R = np.maximum(returns.fillna(0.0).to_numpy(dtype=float), -0.999999)
+    T = len(R)
+    if T == 0:
+        return pd.Series(dtype=float, index=returns.index)
 
-    for date, row in monthly_returns.iterrows():
-        weights = df.set_index("Ticker")["TargetWeight"]
-        port_ret = (row * weights).sum()
-        portfolio_returns.append(port_ret)
+    flags = rebalance_flags(returns.index, rebalance)
+    seg = np.cumsum(flags) - 1
+    starts = np.flatnonzero(flags)
+
+    if isinstance(weights, pd.DataFrame):
+        targets = weights.reindex(columns=tickers).fillna(0.0).sort_index()
+        targets = targets.reindex(returns.index[starts], method="ffill").fillna(0.0).to_numpy()
+    else:
+        target = weights.reindex(tickers).fillna(0.0).to_numpy(dtype=float)
+        targets = np.tile(target, (len(starts), 1))
+    cash = 1.0 - targets.sum(axis=1)
+
+    # growth of each holding since the start of its segment: exp of a log-sum reset at every rebalance
+    log_growth = np.cumsum(np.log1p(R), axis=0)
+    base = np.vstack([np.zeros((1, R.shape[1])), log_growth[starts[1:] - 1]])
+    growth = np.exp(log_growth - base[seg])
+
+    # segment value relative to its starting value of 1
+    value = np.einsum("tn,tn->t", growth, targets[seg]) + cash[seg]
+    prev_value = np.ones(T)
+    prev_value[1:] = value[:-1]
+    prev_value[starts] = 1.0
+    port = value / prev_value - 1.0
+
+    if cost_model is not None:
+        # drifted weights at the end of each segment, just before the next trade
+        ends = np.append(starts[1:] - 1, T - 1)
+        drifted = growth[ends] * targets / value[ends][:, None]
+        held = np.vstack([np.zeros((1, len(tickers))), drifted[:-1]])
+        turnover = np.abs(targets - held)
+        costs = turnover @ cost_rates(tickers, cost_model)
+        port[starts] = (1.0 + port[starts]) * (1.0 - costs) - 1.0
+
+    return pd.Series(port, index=returns.index)
+
+def run_backtest(df, start="2021-01-01", end="2024-01-01", interval="1mo", rebalance=1, cost_model=None):
+    tickers = df["Ticker"].tolist()
+
+    returns = get_returns(tickers, start, end, interval=interval)
+
+    # align columns
+    returns = returns[tickers]
+    weights = df.set_index("Ticker")["TargetWeight"]
 
-    return pd.Series(portfolio_returns, index=monthly_returns.index)
+    return backtest_weights(returns, weights, rebalance=rebalance, cost_model=cost_model)
@@ -1,5 +1,7 @@
 # analysis/catalyst_score.py
 
+from qual.keyword_matcher import headline_hits
+
 CATALYST_KEYWORDS = {
     # very strong catalysts
     "contract": 2.0,
@@ -32,10 +34,9 @@ def catalyst_score(headlines):
     triggers = set()
 
     for h in headlines:
-        h_lower = h.lower()
-        for keyword, weight in CATALYST_KEYWORDS.items():
-            if keyword in h_lower:
-                score += weight
+        for label, keyword in headline_hits(h):
+            if label == "catalyst":
+                score += CATALYST_KEYWORDS[keyword]
                 triggers.add(keyword)
 
     return min(score, MAX_CATALYST_SCORE), list(triggers)
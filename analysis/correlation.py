@@ -1,50 +1,87 @@
 # analysis/correlation.py
 import yfinance as yf
+import numpy as np
 import pandas as pd
+from quant.data import trim_period
 
-def apply_correlation_penalty(df, final_weights, threshold=0.80):
+PENALTY_FACTOR = 0.50
+BLOCK_SIZE = 512
+
+def standardized_returns(prices):
+    """
+    Daily returns scaled so that Z.T @ Z is the correlation matrix. Columns
+    with no data are dropped before incomplete dates are, so one missing
+    ticker does not empty the window. Zero-variance columns become NaN.
+    """
+    returns = prices.dropna(axis=1, how="all").pct_change().dropna()
+    values = returns.to_numpy(dtype=float)
+    centered = values - values.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = centered / np.sqrt((centered ** 2).sum(axis=0))
+    return pd.DataFrame(z, index=returns.index, columns=returns.columns)
+
+def penalty_counts(z, threshold=0.80, block_size=BLOCK_SIZE):
+    """
+    For columns of `z` already ordered by conviction, counts how many
+    higher-ranked columns each one correlates with above `threshold`.
+    Correlations are built one row block at a time against the columns at
+    or after the block, so memory stays at block_size x n.
+    """
+    n = z.shape[1]
+    counts = np.zeros(n, dtype=np.int64)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        with np.errstate(invalid="ignore"):
+            corr = z[:, start:stop].T @ z[:, start:]
+            hits = corr > threshold
+
+        # keep strictly-later columns only (the upper triangle of the full matrix)
+        rows = np.arange(start, stop)[:, None]
+        cols = np.arange(start, n)[None, :]
+        hits &= cols > rows
+
+        counts[start:] += hits.sum(axis=0)
+
+    return counts
+
+def apply_correlation_penalty(df, final_weights, threshold=0.80, prices=None, z=None, verbose=True):
     """
     Penalizes the target weight of assets that are highly correlated to 
     higher-conviction assets in the portfolio.
+    `prices` is an optional (dates x tickers) close panel already in memory;
+    `z` is an optional output of standardized_returns to reuse across calls.
     """
     tickers = df['Ticker'].tolist()
     
     #90-day daily closing prices for the universe
     try:
-        data = yf.download(tickers, period="90d", interval="1d", progress=False)['Close']
-        returns = data.pct_change().dropna()
-        corr_matrix = returns.corr()
+        if z is None:
+            if prices is None:
+                data = yf.download(tickers, period="90d", interval="1d", progress=False)['Close']
+            else:
+                data = trim_period(prices, "90d").reindex(columns=tickers)
+            z = standardized_returns(data)
     except Exception as e:
         print(f"Correlation calculation failed: {e}. Bypassing penalty.")
         return final_weights
 
-    adjusted_weights = final_weights.copy()
-    
     #prioritize the highest-ranked stocks (conviction)
-    sorted_indices = df.sort_values("AdjPortfolioScore", ascending=False).index
+    ranked = df.sort_values("AdjPortfolioScore", ascending=False)
+    ranked = ranked[ranked['Ticker'].isin(z.columns)]
 
-    for i in range(len(sorted_indices)):
-        idx_primary = sorted_indices[i]
-        ticker_primary = df.loc[idx_primary, 'Ticker']
-        
-        for j in range(i + 1, len(sorted_indices)):
-            idx_secondary = sorted_indices[j]
-            ticker_secondary = df.loc[idx_secondary, 'Ticker']
-            
-            try:
-                # correl
-                correlation = corr_matrix.loc[ticker_primary, ticker_secondary]
-                
-                # slash the secondary asset's weight by 50% if high correl
-                if correlation > threshold:
-                    penalty_factor = 0.50
-                    adjusted_weights.loc[idx_secondary] *= penalty_factor
-                    print(f"CORRELATION PENALTY: {ticker_secondary} is {correlation:.2f} correlated to {ticker_primary}. Weight reduced.")
-            except KeyError:
-                continue
+    # each higher-conviction match halves the secondary asset's weight
+    counts = penalty_counts(z[ranked['Ticker']].to_numpy(), threshold)
+    factors = pd.Series(PENALTY_FACTOR ** counts, index=ranked.index)
+
+    for ticker, count in zip(ranked['Ticker'], counts):
+        if count and verbose:
+            print(f"CORRELATION PENALTY: {ticker} is >{threshold:.2f} correlated to {count} higher-conviction holding(s). Weight reduced.")
+
+    adjusted_weights = final_weights * factors.reindex(final_weights.index, fill_value=1.0)
 
     # Re-normalize 
     if adjusted_weights.sum() > 0:
         return adjusted_weights / adjusted_weights.sum()
         
-    return adjusted_weights
\ No newline at end of file
+    return adjusted_weights
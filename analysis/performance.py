@@ -0,0 +1,89 @@
+# analysis/performance.py
+
+import numpy as np
+import pandas as pd
+
+def _as_frame(returns):
+    return returns.to_frame() if isinstance(returns, pd.Series) else returns
+
+def rolling_returns(returns, window=12):
+    """
+    Compounded trailing returns over `window` periods for every column,
+    computed as a rolling sum of log returns.
+    """
+    return np.expm1(np.log1p(_as_frame(returns)).rolling(window).sum())
+
+def drawdowns(returns):
+    """
+    Drawdown path for every column: (cumulative / running peak) - 1. The
+    starting capital counts as the first peak, so a losing first period is
+    already a drawdown.
+    """
+    cumulative = (1 + _as_frame(returns).fillna(0.0)).cumprod()
+    return cumulative / cumulative.cummax().clip(lower=1.0) - 1
+
+def drawdown_stats(returns):
+    """
+    Per column: deepest drawdown, longest underwater stretch (in periods) and
+    the periods taken to recover from the deepest trough (NaN if it has not,
+    0 if the column was never underwater).
+    """
+    dd = drawdowns(returns)
+    values = dd.to_numpy()
+    idx = np.arange(len(values))[:, None]
+
+    # periods since the last time each column stood at its peak
+    at_peak = values == 0
+    last_peak = np.maximum.accumulate(np.where(at_peak, idx, -1), axis=0)
+    underwater = np.where(at_peak, 0, idx - last_peak)
+
+    trough = values.argmin(axis=0) if len(values) else np.zeros(values.shape[1], dtype=int)
+    recovered = at_peak & (idx > trough[None, :])
+    recovery = np.where(recovered.any(axis=0), recovered.argmax(axis=0) - trough, np.nan)
+    # a column that never left its peak has no drawdown to recover from
+    recovery = np.where(values.min(axis=0) == 0, 0, recovery) if len(values) else recovery
+
+    return pd.DataFrame({
+        "MaxDrawdown": values.min(axis=0) if len(values) else np.nan,
+        "MaxDrawdownDuration": underwater.max(axis=0) if len(values) else 0,
+        "RecoveryPeriods": recovery,
+    }, index=dd.columns)
+
+def tearsheet(returns, periods_per_year=12):
+    """
+    One row of statistics per return column (strategy variant), all computed
+    column-wise in a single pass. AnnReturn and the drawdown-adjusted Sharpe
+    keep the legacy definitions: (1 + mean)^p - 1 and
+    AnnReturn / (AnnVol * |MaxDrawdown|). Sharpe and Sortino assume a zero
+    risk-free rate.
+    """
+    frame = _as_frame(returns)
+    p = periods_per_year
+
+    count = frame.count()
+    mean = frame.mean()
+    std = frame.std()
+    downside = np.sqrt((frame.clip(upper=0) ** 2).mean())
+
+    total = np.expm1(np.log1p(frame).sum())
+    cagr = (1 + total) ** (p / count) - 1
+    ann_return = (1 + mean) ** p - 1
+    ann_vol = std * np.sqrt(p)
+
+    stats = drawdown_stats(frame)
+    depth = stats["MaxDrawdown"].abs()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = pd.DataFrame({
+            "TotalReturn": total,
+            "AnnReturn": ann_return,
+            "CAGR": cagr,
+            "AnnVol": ann_vol,
+            "Sharpe": mean / std * np.sqrt(p),
+            "Sortino": mean / downside * np.sqrt(p),
+            "Calmar": cagr / depth,
+            "DDAdjSharpe": ann_return / (ann_vol * depth),
+        })
+
+    table = table.join(stats)
+    return table.replace([np.inf, -np.inf], np.nan)
@@ -1,39 +1,91 @@
 # analysis/portfolio.py
+import numpy as np
 import pandas as pd
 from analysis.correlation import apply_correlation_penalty
 
-def allocate_portfolio(df, max_sector_weight=0.30):
+def _segment_cumsum(values, starts):
+    # cumulative sums restarting at every index in `starts` (sorted group boundaries)
+    total = np.cumsum(values)
+    offset = np.zeros_like(total)
+    offset[starts[1:]] = total[starts[1:] - 1]
+    return total - np.maximum.accumulate(offset)
+
+def fill_levels(desired, caps, groups, targets, n_groups):
+    """
+    Per group g, the water level L solving sum(min(caps, L * desired)) =
+    targets[g] over the group's names with desired > 0, or inf where the
+    group's caps add up to less than its target. Names are sorted by the
+    level at which they hit their cap (caps / desired); the names capped
+    below the solution form a prefix, and the rest share what is left in
+    proportion to `desired`.
+    """
+    live = desired > 0
+    index = np.flatnonzero(live)
+    levels = np.full(n_groups, np.inf)
+    if not len(index):
+        return levels
+
+    g, d, c = groups[index], desired[index], caps[index]
+    order = np.lexsort((c / d, g))
+    g, d, c = g[order], d[order], c[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+
+    group_d = np.bincount(g, weights=d, minlength=n_groups)
+    # group sum at the k-th breakpoint: names up to k capped, the rest at level b_k
+    at_break = _segment_cumsum(c, starts) + (c / d) * (group_d[g] - _segment_cumsum(d, starts))
+    capped = at_break < targets[g]
+
+    capped_sum = np.bincount(g, weights=np.where(capped, c, 0.0), minlength=n_groups)
+    free_d = group_d - np.bincount(g, weights=np.where(capped, d, 0.0), minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        solved = (targets - capped_sum) / free_d
+    return np.where(free_d > 0, solved, np.inf)
+
+def water_fill(desired, caps, groups, group_cap):
+    """
+    Allocates a unit budget in proportion to `desired` subject to per-name
+    `caps` and a `group_cap` on the sum of each group (integer codes in
+    `groups`). Every name gets min(cap, level * desired) for one shared
+    water level, where a group that would breach its cap stops at its own
+    lower level. Weight clipped by a cap therefore flows to the names that
+    still have room without flattening their relative conviction. Budget
+    the caps cannot absorb stays as cash.
+    """
+    desired = np.asarray(desired, dtype=float)
+    caps = np.maximum(np.asarray(caps, dtype=float), 0.0)
+    groups = np.asarray(groups)
+    n_groups = groups.max() + 1 if len(groups) else 0
+
+    # each group's own level turns its cap into a tighter cap per name
+    group_levels = fill_levels(desired, caps, groups, np.full(n_groups, float(group_cap)), n_groups)
+    with np.errstate(invalid="ignore"):
+        effective = np.minimum(caps, np.where(desired > 0, group_levels[groups] * desired, 0.0))
+
+    level = fill_levels(desired, effective, np.zeros(len(desired), dtype=int), np.ones(1), 1)[0]
+    with np.errstate(invalid="ignore"):
+        weights = np.minimum(effective, level * desired)
+    return np.where(desired > 0, weights, 0.0)
+
+def allocate_portfolio(df, max_sector_weight=0.30, prices=None, correlation_threshold=0.80, z=None, verbose=True):
     scores = df["AdjPortfolioScore"].clip(lower=0)
     risk_weights = df["VolMultiplier"]
     composite_score = scores * risk_weights
     
     total = composite_score.sum()
     if total == 0:
-        return pd.Series([0.0] * len(df))
+        return pd.Series(0.0, index=df.index)
 
     raw_weights = composite_score / total
-    capped_weights = pd.Series(0.0, index=df.index)
-    sector_exposure = {}
-
-    for idx, row in df.sort_values("AdjPortfolioScore", ascending=False).iterrows():
-        sector = row["Sector"]
-        cap = row["LiquidityCap"]
-        proposed_weight = raw_weights.loc[idx]
-        
-        weight = min(proposed_weight, cap)
-        current_sector_weight = sector_exposure.get(sector, 0.0)
-        
-        if current_sector_weight + weight > max_sector_weight:
-            weight = max(0, max_sector_weight - current_sector_weight)
-            
-        capped_weights.loc[idx] = weight
-        sector_exposure[sector] = current_sector_weight + weight
-
-    # Normalize 
-    if capped_weights.sum() > 0:
-        capped_weights = capped_weights / capped_weights.sum()
-        
-    # correl penalty
-    final_weights = apply_correlation_penalty(df, capped_weights)
-    
-    return final_weights
\ No newline at end of file
+
+    # correl penalty shapes the preferred weights before caps are enforced,
+    # so its re-normalization can no longer push names back over a cap
+    preferred = apply_correlation_penalty(
+        df, raw_weights, threshold=correlation_threshold, prices=prices, z=z, verbose=verbose
+    )
+    if preferred.sum() <= 0:
+        return pd.Series(0.0, index=df.index)
+
+    sectors, _ = pd.factorize(df["Sector"].fillna("Unknown"))
+    weights = water_fill(preferred.to_numpy(), df["LiquidityCap"].to_numpy(), sectors, max_sector_weight)
+
+    return pd.Series(weights, index=df.index)
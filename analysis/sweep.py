@@ -0,0 +1,137 @@
+# analysis/sweep.py
+
+import itertools
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from quant.screener_engine import (
+    SCORE_WEIGHTS,
+    BEAR_DIVIDEND_MULT,
+    BEAR_VOL_MULT,
+    CORRELATION_THRESHOLD,
+    BENCHMARK,
+    compute_portfolio_scores,
+    get_market_regime,
+)
+from quant.data import get_price_panel, get_ticker_history, trim_period
+from analysis.portfolio import allocate_portfolio
+from analysis.correlation import standardized_returns
+from analysis.backtest import get_returns, backtest_weights
+from analysis.performance import tearsheet
+from quant.screen_store import load_screen
+
+# every tunable knob of the screener blend, with the values currently shipped
+DEFAULT_PARAMS = {
+    **{f"w_{col}": w for col, w in SCORE_WEIGHTS.items()},
+    "bear_dividend_mult": BEAR_DIVIDEND_MULT,
+    "bear_vol_mult": BEAR_VOL_MULT,
+    "correlation_threshold": CORRELATION_THRESHOLD,
+}
+
+# read-only inputs shared by every configuration, installed once per worker
+_shared = {}
+
+def _init_worker(universe, returns, z, regime, backtest_kwargs):
+    _shared.update(universe=universe, returns=returns, z=z, regime=regime, backtest_kwargs=backtest_kwargs)
+
+def rescore(universe, params, regime):
+    """
+    Re-applies the PortfolioScore blend and regime multipliers to a screened
+    universe (run_full_screener output) without touching any data source.
+    """
+    df = universe.copy()
+    bear = regime == "BEAR"
+
+    div_mult = params["bear_dividend_mult"] if bear else 1.0
+    vol_mult = params["bear_vol_mult"] if bear else 1.0
+
+    df["AdjValuationScore"] = (df["ValuationScore"] + df["DividendAdj"] * div_mult).clip(upper=1.0)
+    df["VolMultiplier"] = df["BaseVolMultiplier"] * vol_mult
+
+    weights = {col: params[f"w_{col}"] for col in SCORE_WEIGHTS}
+    return compute_portfolio_scores(df, weights)
+
+def evaluate(params):
+    df = rescore(_shared["universe"], params, _shared["regime"])
+    weights = allocate_portfolio(
+        df,
+        correlation_threshold=params["correlation_threshold"],
+        z=_shared["z"],
+        verbose=False,
+    )
+
+    returns = backtest_weights(
+        _shared["returns"],
+        pd.Series(weights.to_numpy(), index=df["Ticker"]),
+        **_shared["backtest_kwargs"],
+    )
+
+    return {**params, "Holdings": int((weights > 0).sum())}, returns.to_numpy()
+
+def build_configs(grid=None, samples=None, seed=0):
+    """
+    Expands `grid` ({param: [values]}) into configurations. Parameters not in
+    the grid keep DEFAULT_PARAMS. With `samples` set, that many combinations
+    are drawn at random instead of the full product.
+    """
+    grid = grid or {}
+    names = list(grid)
+
+    if samples is None:
+        combos = itertools.product(*(grid[n] for n in names))
+    else:
+        rng = np.random.default_rng(seed)
+        combos = zip(*(rng.choice(grid[n], size=samples) for n in names)) if names else [()] * samples
+
+    return [{**DEFAULT_PARAMS, **{n: float(v) for n, v in zip(names, combo)}} for combo in combos]
+
+def run_sweep(universe, returns, z, regime, grid=None, samples=None, processes=None,
+              rank_by="Sharpe", seed=0, periods_per_year=12, **backtest_kwargs):
+    """
+    Scores every configuration against one screened universe. The universe,
+    the returns panel and the standardized correlation returns are shipped to
+    each worker once; only parameter dicts travel per task.
+    Returns a results table ranked by `rank_by`, best first.
+    """
+    configs = build_configs(grid, samples, seed)
+    initargs = (universe, returns, z, regime, backtest_kwargs)
+
+    processes = processes or os.cpu_count()
+    chunksize = max(1, len(configs) // (processes * 4))
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=initargs) as pool:
+        results = list(pool.map(evaluate, configs, chunksize=chunksize))
+
+    # every variant's return path side by side, summarized in one vectorized pass
+    paths = pd.DataFrame(np.column_stack([r for _, r in results]), index=returns.index)
+    stats = tearsheet(paths, periods_per_year=periods_per_year).reset_index(drop=True)
+
+    table = pd.concat([pd.DataFrame([p for p, _ in results]), stats], axis=1)
+    return table.sort_values(rank_by, ascending=False).reset_index(drop=True)
+
+def load_sweep_inputs(start="2021-01-01", end="2024-01-01"):
+    universe = load_screen()
+    tickers = universe["Ticker"].tolist()
+
+    panel = get_price_panel(tickers + [BENCHMARK], period="1y")
+    regime = get_market_regime(hist=get_ticker_history(panel, BENCHMARK))
+    z = standardized_returns(trim_period(panel["Close"], "90d").reindex(columns=tickers))
+    returns = get_returns(tickers, start, end)[tickers]
+
+    return universe, returns, z, regime
+
+if __name__ == "__main__":
+    universe, returns, z, regime = load_sweep_inputs()
+    grid = {
+        "w_QuantScore": [0.8, 1.2, 1.6],
+        "w_CatalystScore": [1.0, 1.5, 2.0],
+        "w_AdjValuationScore": [1.0, 2.0, 3.0],
+        "w_TechScore": [0.5, 1.0, 1.5],
+        "bear_vol_mult": [0.6, 0.8, 1.0],
+        "correlation_threshold": [0.7, 0.8, 0.9],
+    }
+    table = run_sweep(universe, returns, z, regime, grid=grid)
+    table.to_csv("sweep_results.csv", index=False)
+    print(table.head(20))
@@ -0,0 +1,120 @@
+# analysis/universe_scoring.py
+
+import numpy as np
+import pandas as pd
+from quant.sector_rules import SECTOR_RULES, DEFAULT_RULES
+from analysis.sector_pe import SECTOR_MEDIAN_PE
+from analysis.gov_exposure import GOV_SECTORS
+
+RATIO_COLUMNS = ["pe", "roe", "debt_to_equity", "margin", "revenue_growth"]
+RULE_KEYS = ["pe_max", "roe_min", "debt_to_equity_max", "margin_min", "growth_min"]
+
+FACTOR_NAMES = ["Valuation (P/E)", "Profitability (ROE)", "Leverage", "Margins", "Growth"]
+RISK_FLAG_NAMES = ["Valuation risk (high P/E)", "Balance sheet leverage", "Low growth profile"]
+SCENARIO_NAMES = ["BUY if P/E falls below 25", "Upgrade if revenue growth re-accelerates >10%"]
+
+def _column(frame, name):
+    return frame[name].astype(float).to_numpy() if name in frame else np.full(len(frame), np.nan)
+
+def _present(values):
+    # mirrors the scalar `if ratios[x] and ...` checks: missing and zero both fail
+    return ~np.isnan(values) & (values != 0)
+
+def _joined_labels(masks, names, sep):
+    """
+    Encodes each row's boolean masks as a bit pattern and looks the joined
+    label string up from a precomputed table, so no per-row string work is done.
+    """
+    bits = np.zeros(len(masks[0]), dtype=np.int64)
+    for i, mask in enumerate(masks):
+        bits |= mask.astype(np.int64) << i
+
+    table = np.array([
+        sep.join(name for i, name in enumerate(names) if pattern >> i & 1)
+        for pattern in range(1 << len(names))
+    ], dtype=object)
+    return table[bits]
+
+def _sector_codes(sectors, names):
+    # position of each row's sector in `names`; unknown sectors map to len(names)
+    codes = pd.Index(list(names)).get_indexer(sectors)
+    return np.where(codes < 0, len(names), codes)
+
+def _sector_lookup(codes, values, default):
+    return np.append(np.array(values, dtype=float), default)[codes]
+
+def score_universe(frame, sector_rules=SECTOR_RULES, default_rules=DEFAULT_RULES):
+    """
+    Batch counterpart of the per-ticker scoring helpers. `frame` holds one row
+    per ticker with the extract_ratios columns plus `sector`, `dividend_yield`
+    and `avg_daily_value`. Returns a frame on the same index with the columns
+    run_full_screener writes for score_quant, factor_breakdown, risk_flags,
+    scenario_triggers, valuation_score, dividend_adjustment, liquidity_cap,
+    turnaround_flag and gov_spend_sensitivity.
+
+    Missing values (NaN) follow the scalar functions' None handling.
+    """
+    pe, roe, de, margin, growth = (_column(frame, c) for c in RATIO_COLUMNS)
+    sectors = frame["sector"].fillna("Unknown").to_numpy() if "sector" in frame else np.full(len(frame), "Unknown")
+    div_yield = _column(frame, "dividend_yield")
+    adv = _column(frame, "avg_daily_value")
+
+    # sector thresholds, one column per rule
+    rule_codes = _sector_codes(sectors, sector_rules)
+    rules = {
+        key: _sector_lookup(rule_codes, [r[key] for r in sector_rules.values()], default_rules[key])
+        for key in RULE_KEYS
+    }
+
+    with np.errstate(invalid="ignore"):
+        factors = [
+            _present(pe) & (pe < rules["pe_max"]),
+            _present(roe) & (roe > rules["roe_min"]),
+            _present(de) & (de < rules["debt_to_equity_max"]),
+            _present(margin) & (margin > rules["margin_min"]),
+            _present(growth) & (growth > rules["growth_min"]),
+        ]
+
+        flags = [
+            _present(pe) & (pe > 30),
+            _present(de) & (de > 150),
+            _present(growth) & (growth < 0.03),
+        ]
+        triggers = [
+            _present(pe) & (pe > 30),
+            _present(growth) & (growth < 0.10),
+        ]
+
+        turnaround = (growth < 0.05) & (margin < 0.05) & (de > 100)
+
+        median_pe = _sector_lookup(_sector_codes(sectors, SECTOR_MEDIAN_PE), list(SECTOR_MEDIAN_PE.values()), 15)
+        ratio = pe / median_pe
+        val_score = np.select(
+            [np.isnan(pe) | (pe <= 0), ratio < 0.6, ratio < 0.8, ratio < 1.0, ratio < 1.3],
+            [0.5, 1.0, 0.8, 0.6, 0.4],
+            default=0.1,
+        )
+
+        div_adj = np.select(
+            [np.isnan(div_yield) | (div_yield <= 0), div_yield >= 0.06, div_yield >= 0.04, div_yield >= 0.025],
+            [0.0, 0.3, 0.2, 0.1],
+            default=0.0,
+        )
+
+        liquidity = np.select(
+            [np.isnan(adv), adv >= 10_000_000, adv >= 5_000_000, adv >= 1_000_000, adv >= 500_000],
+            [0.03, 0.20, 0.15, 0.10, 0.06],
+            default=0.02,
+        )
+
+    return pd.DataFrame({
+        "QuantScore": np.sum(factors, axis=0),
+        "GovScore": np.isin(sectors, GOV_SECTORS).astype(int),
+        "Turnaround": turnaround,
+        "ValuationScore": val_score,
+        "DividendAdj": div_adj,
+        "LiquidityCap": liquidity,
+        "PassedFactors": _joined_labels(factors, FACTOR_NAMES, ", "),
+        "RiskFlags": _joined_labels(flags, RISK_FLAG_NAMES, "; "),
+        "ScenarioTriggers": _joined_labels(triggers, SCENARIO_NAMES, "; "),
+    }, index=frame.index)
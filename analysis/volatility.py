@@ -2,10 +2,14 @@
 
 import yfinance as yf
 import numpy as np
+from quant.data import trim_period
 
-def get_volatility_multiplier(ticker):
+def get_volatility_multiplier(ticker, hist=None):
     try:
-        hist = yf.Ticker(ticker).history(period="3mo")
+        if hist is None:
+            hist = yf.Ticker(ticker).history(period="3mo")
+        else:
+            hist = trim_period(hist, "3mo")
         if len(hist) < 30:
             return 1.0
             
@@ -4,18 +4,23 @@ from tigeropen.tiger_open_config import TigerOpenClientConfig
 from tigeropen.common.util.signature_utils import read_private_key
 from tigeropen.trade.trade_client import TradeClient
 from tigeropen.quote.quote_client import QuoteClient
+from tigeropen.push.push_client import PushClient
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-def get_tiger_client():
+def get_client_config():
     client_config = TigerOpenClientConfig(sandbox_debug=False)
     key_path = os.getenv("PRIVATE_KEY_PATH")
     client_config.private_key = read_private_key(key_path) 
     client_config.language = 'en_US'
     client_config.tiger_id = os.getenv("TIGER_ID")
     client_config.account = os.getenv("TIGER_ACCOUNT")
+    return client_config
+
+def get_tiger_client():
+    client_config = get_client_config()
     
     trade_client = TradeClient(client_config)
     
@@ -31,6 +36,21 @@ def get_tiger_client():
         
     return trade_client, quote_client, client_config.account
 
+def get_push_client():
+    """
+    Connected PushClient for streaming quotes, or None if the socket could
+    not be opened (the cycle then trades off polled data alone).
+    """
+    client_config = get_client_config()
+    protocol, host, port = client_config.socket_host_port
+    push_client = PushClient(host, port, use_ssl=(protocol == 'ssl'))
+    try:
+        push_client.connect(client_config.tiger_id, client_config.private_key)
+    except Exception as e:
+        print(f" Push connection failed, streaming disabled: {e}")
+        return None
+    return push_client
+
 if __name__ == "__main__":
     try:
         print("--- Testing Tiger Brokers API Connection ---")
@@ -0,0 +1,67 @@
+# execution/dispatcher.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from quant.rate_limit import RateLimiter
+from execution.order_manager import execute_trade
+from execution.trade_journal import get_trade_journal
+
+# Tiger's trade endpoints (place/modify/cancel order) allow roughly 120
+# requests per minute; stay just under it with a small burst allowance
+ORDER_WORKERS = 8
+ORDER_REQUESTS_PER_SECOND = 1.8
+ORDER_BURST = 4
+
+class OrderDispatcher:
+    """
+    Submits trades for independent tickers in parallel. Each ticker runs as
+    one task, so its parent order, trailing stop and log entry stay in
+    sequence; tasks for the same ticker are serialized. Every place_order
+    call draws from one shared token bucket, so a full rebalance is bound by
+    the broker's quota rather than by the sum of round trips.
+    """
+
+    def __init__(self, session, max_workers=ORDER_WORKERS,
+                 requests_per_second=ORDER_REQUESTS_PER_SECOND, burst=ORDER_BURST):
+        self.session = session
+        self.limiter = RateLimiter(requests_per_second, burst=burst)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.lock = threading.Lock()
+        self.ticker_locks = {}
+        self.pending = []
+
+    def _ticker_lock(self, ticker):
+        with self.lock:
+            return self.ticker_locks.setdefault(ticker, threading.Lock())
+
+    def _run(self, ticker, target_weight, signal_type, latest_price):
+        with self._ticker_lock(ticker):
+            execute_trade(self.session, ticker, target_weight, signal_type=signal_type,
+                          latest_price=latest_price, limiter=self.limiter)
+
+    def submit(self, ticker, target_weight, signal_type="UNKNOWN", latest_price=None):
+        future = self.pool.submit(self._run, ticker, target_weight, signal_type, latest_price)
+        with self.lock:
+            self.pending.append(future)
+        return future
+
+    def drain(self):
+        """
+        Blocks until every submitted trade has finished, so the session's
+        positions reflect them before the next phase reads it, then makes
+        their journal entries durable.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, []
+        wait(pending)
+        get_trade_journal().flush()
+
+    def close(self):
+        self.drain()
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
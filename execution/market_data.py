@@ -0,0 +1,133 @@
+# execution/market_data.py
+
+from contextlib import contextmanager
+import pandas as pd
+import yfinance as yf
+
+# yfinance suffix -> Tiger quote market; names on other markets are priced through yfinance
+TIGER_QUOTE_MARKETS = {"": "US", "HK": "HK", "SI": "SG"}
+
+def split_ticker(ticker):
+    symbol, _, suffix = ticker.partition('.')
+    return symbol.upper(), suffix.upper()
+
+def broker_symbol(ticker):
+    symbol, suffix = split_ticker(ticker)
+    # Tiger quotes HK names with five-digit codes (0700.HK -> 00700)
+    return symbol.zfill(5) if suffix == "HK" else symbol
+
+def ambiguous_symbols(tickers):
+    """
+    Broker symbols shared by listings on more than one exchange (D05 and
+    D05.SI). Tiger's batched quote calls take bare symbols with no market, so
+    their answers for these cannot be attributed to a listing.
+    """
+    listings = {}
+    for ticker in tickers:
+        listings.setdefault(broker_symbol(ticker), set()).add(split_ticker(ticker)[1])
+    return {symbol for symbol, suffixes in listings.items() if len(suffixes) > 1}
+
+def _tiger_prices(quote_client, tickers):
+    prices = {}
+    by_market = {}
+    for ticker in tickers:
+        market = TIGER_QUOTE_MARKETS.get(split_ticker(ticker)[1])
+        if market:
+            by_market.setdefault(market, {})[broker_symbol(ticker)] = ticker
+
+    # ambiguous symbols are left to the yfinance fallback, which is keyed by full ticker
+    ambiguous = ambiguous_symbols(tickers)
+
+    for market, symbols in by_market.items():
+        symbols = {s: t for s, t in symbols.items() if s not in ambiguous}
+        if not symbols:
+            continue
+        try:
+            briefs = quote_client.get_stock_briefs(list(symbols))
+        except Exception as e:
+            print(f"Tiger quote snapshot failed for {market}: {e}")
+            continue
+
+        for symbol, price in zip(briefs['symbol'], briefs['latest_price']):
+            if symbol in symbols and price and price > 0:
+                prices[symbols[symbol]] = float(price)
+
+    return prices
+
+def _yfinance_prices(tickers):
+    try:
+        closes = yf.download(tickers, period="5d", interval="1d", progress=False)['Close']
+        latest = closes.ffill().iloc[-1]
+    except Exception as e:
+        print(f"yfinance quote snapshot failed: {e}")
+        return {}
+
+    return {t: float(p) for t, p in latest.items() if p == p and p > 0}
+
+def get_price_snapshot(quote_client, tickers):
+    """
+    Last prices for a whole target list, keyed by yfinance ticker. Names are
+    priced through the authenticated Tiger QuoteClient in one batched briefs
+    call per market; anything Tiger cannot price falls back to a single
+    batched yfinance download. Every phase of a cycle sizes orders off this
+    one snapshot.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    prices = _tiger_prices(quote_client, tickers) if quote_client is not None else {}
+
+    missing = [t for t in tickers if t not in prices]
+    if missing:
+        prices.update(_yfinance_prices(missing))
+
+    for ticker in tickers:
+        if ticker not in prices:
+            print(f"QUOTE MISSING: no price for {ticker} in this cycle's snapshot.")
+
+    return prices
+
+def stream_quotes(push_client, engine, tickers):
+    """
+    Feeds Tiger push quotes for `tickers` into an IntradayEngine. Tiger
+    pushes the session's cumulative volume, so each trade's size is the
+    change since the previous push for that symbol. Returns the subscribed
+    broker symbols.
+    """
+    by_symbol = {broker_symbol(t): t for t in tickers if split_ticker(t)[1] in TIGER_QUOTE_MARKETS}
+    last_volume = {}
+
+    def on_quote(frame):
+        ticker = by_symbol.get(frame.symbol)
+        if ticker is None or not frame.latestPrice:
+            return
+
+        previous = last_volume.get(ticker)
+        last_volume[ticker] = frame.volume
+        # a drop in cumulative volume means a new session started
+        size = frame.volume - previous if previous is not None and frame.volume >= previous else 0
+
+        time = pd.Timestamp(frame.timestamp, unit="ms", tz="UTC")
+        engine.on_tick(ticker, time, float(frame.latestPrice), float(size))
+
+    push_client.quote_changed = on_quote
+    push_client.subscribe_quote(list(by_symbol))
+    return list(by_symbol)
+
+@contextmanager
+def quote_stream(push_client, engine, tickers):
+    """
+    Streams quotes into `engine` for the duration of the block, then
+    unsubscribes and disconnects. A None client streams nothing.
+    """
+    if push_client is None:
+        yield []
+        return
+
+    symbols = stream_quotes(push_client, engine, tickers)
+    try:
+        yield symbols
+    finally:
+        try:
+            push_client.unsubscribe_quote(symbols)
+            push_client.disconnect()
+        except Exception as e:
+            print(f"Quote stream shutdown failed: {e}")
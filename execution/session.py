@@ -0,0 +1,72 @@
+# execution/session.py
+
+import threading
+
+from execution.market_data import split_ticker, broker_symbol
+from execution.symbol_master import MARKETS
+
+def position_key(symbol, currency):
+    """
+    Index key for a broker position: the bare symbol plus its settlement
+    currency, so D05 on SGX and a D05 listed elsewhere stay apart.
+    """
+    symbol = symbol.split('.')[0].upper()
+    if currency == MARKETS["HK"]["currency"]:
+        symbol = symbol.zfill(5)
+    return symbol, currency
+
+def ticker_key(ticker):
+    spec = MARKETS.get(split_ticker(ticker)[1], MARKETS[""])
+    return position_key(broker_symbol(ticker), spec["currency"])
+
+class TradingSession:
+    """
+    Broker account state for one trading cycle. Assets, positions and open
+    orders are loaded once; every phase reads them from memory, and orders
+    placed during the cycle are applied to the local copy instead of
+    re-polling the broker.
+    """
+
+    def __init__(self, trade_client, account_id):
+        self.trade_client = trade_client
+        self.account_id = account_id
+        self.lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        assets = self.trade_client.get_assets()
+        self.portfolio_value = assets[0].segments['S'].equity_with_loan
+
+        # positions indexed once by (symbol, currency); every lookup is a dict hit
+        self.positions = {}
+        for pos in self.trade_client.get_positions(account=self.account_id) or []:
+            key = position_key(pos.contract.symbol, getattr(pos.contract, 'currency', None))
+            self.positions[key] = self.positions.get(key, 0) + pos.quantity
+
+        try:
+            self.open_orders = list(self.trade_client.get_open_orders(account=self.account_id) or [])
+        except Exception as e:
+            print(f"Open order check failed: {e}")
+            self.open_orders = []
+
+    def quantity(self, ticker):
+        return self.positions.get(ticker_key(ticker), 0)
+
+    def holdings(self):
+        with self.lock:
+            return [(symbol, currency, qty) for (symbol, currency), qty in self.positions.items() if qty > 0]
+
+    def record_fill(self, ticker, action, quantity):
+        """
+        Applies a transmitted market order to the cycle's positions, assuming
+        it fills in full.
+        """
+        key = ticker_key(ticker)
+        delta = quantity if action == 'BUY' else -quantity
+        with self.lock:
+            self.positions[key] = self.positions.get(key, 0) + delta
+
+    def record_open_order(self, order):
+        # resting orders (trailing stops) placed this cycle
+        with self.lock:
+            self.open_orders.append(order)
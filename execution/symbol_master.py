@@ -0,0 +1,221 @@
+# execution/symbol_master.py
+
+import sqlite3
+import threading
+import time
+from execution.market_data import split_ticker, broker_symbol, ambiguous_symbols
+
+SYMBOL_MASTER = "symbol_master.db"
+
+# listings are stable; re-resolve an entry at most once a week
+REFRESH_AFTER = 7 * 24 * 60 * 60
+
+# yfinance suffix -> Tiger market, settlement currency and the board lot used
+# when the broker does not report one
+MARKETS = {
+    "": {"market": "US", "currency": "USD", "lot_size": 1},
+    "SI": {"market": "SG", "currency": "SGD", "lot_size": 100},
+    "HK": {"market": "HK", "currency": "HKD", "lot_size": 1},
+    "NS": {"market": "IN", "currency": "INR", "lot_size": 1},
+}
+SUFFIX_BY_CURRENCY = {spec["currency"]: suffix for suffix, spec in MARKETS.items()}
+
+COLUMNS = ("ticker", "symbol", "market", "exchange", "currency", "lot_size", "contract_id", "resolved_at")
+
+def yfinance_ticker(symbol, currency):
+    """
+    Inverse of broker_symbol for a position the master has not seen:
+    the settlement currency names the market, not the shape of the symbol.
+    """
+    suffix = SUFFIX_BY_CURRENCY.get(currency)
+    if suffix is None:
+        return None
+    if suffix == "HK":
+        # Tiger pads HK codes to five digits, yfinance to four (00700 -> 0700.HK)
+        symbol = symbol.lstrip("0").zfill(4)
+    return f"{symbol}.{suffix}" if suffix else symbol
+
+class SymbolMaster:
+    """
+    Persistent map from yfinance tickers to Tiger contracts, exchange and
+    board-lot size. Entries are resolved against the broker once, indexed in
+    memory by ticker and by (broker symbol, currency), and re-resolved lazily
+    when older than REFRESH_AFTER.
+    """
+
+    def __init__(self, path=SYMBOL_MASTER):
+        self.path = path
+        self.lock = threading.Lock()
+        self.contracts = {}
+        # remembered from prefetch so lazy resolutions also get real board lots
+        self.quote_client = None
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS symbols (
+                    ticker TEXT PRIMARY KEY,
+                    symbol TEXT NOT NULL,
+                    market TEXT NOT NULL,
+                    exchange TEXT,
+                    currency TEXT NOT NULL,
+                    lot_size INTEGER NOT NULL,
+                    contract_id INTEGER,
+                    resolved_at REAL NOT NULL
+                )"""
+            )
+            rows = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM symbols").fetchall()
+
+        self.by_ticker = {}
+        self.by_symbol = {}
+        for row in rows:
+            self._index(dict(zip(COLUMNS, row)))
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _index(self, entry):
+        self.by_ticker[entry["ticker"]] = entry
+        self.by_symbol[(entry["symbol"], entry["currency"])] = entry
+
+    def _stale(self, ticker):
+        entry = self.by_ticker.get(ticker)
+        return entry is None or time.time() - entry["resolved_at"] > REFRESH_AFTER
+
+    def _lookup_contract(self, trade_client, ticker):
+        symbol, suffix = split_ticker(ticker)
+        currency = MARKETS[suffix]["currency"]
+
+        contracts = trade_client.get_contracts(broker_symbol(ticker), sec_type='STK', currency=currency)
+        if not contracts and suffix:
+            contracts = trade_client.get_contracts(ticker, sec_type='STK')
+        return contracts[0] if contracts else None
+
+    def _lot_sizes(self, quote_client, tickers):
+        # one trade-meta request per market for every newly resolved name
+        lots = {}
+        by_market = {}
+        for ticker in tickers:
+            by_market.setdefault(MARKETS[split_ticker(ticker)[1]]["market"], {})[broker_symbol(ticker)] = ticker
+
+        # get_trade_metas takes bare symbols and no market, so a symbol listed on
+        # several markets could come back with the other listing's lot; those keep
+        # the contract's or the market's default lot instead
+        ambiguous = ambiguous_symbols(list(tickers) + list(self.by_ticker))
+        by_market = {
+            market: {s: t for s, t in symbols.items() if s not in ambiguous}
+            for market, symbols in by_market.items()
+        }
+
+        for market, symbols in by_market.items():
+            if not symbols:
+                continue
+            try:
+                metas = quote_client.get_trade_metas(list(symbols))
+            except Exception as e:
+                print(f"Lot size lookup failed for {market}: {e}")
+                continue
+            for symbol, lot in zip(metas['symbol'], metas['lot_size']):
+                if symbol in symbols and lot and lot > 0:
+                    lots[symbols[symbol]] = int(lot)
+
+        return lots
+
+    def prefetch(self, trade_client, tickers, quote_client=None):
+        """
+        Resolves every missing or stale ticker in one pass, so the orders of a
+        cycle are served from memory. A failed refresh keeps the old entry.
+        The quote client is kept for later lazy resolutions in contract().
+        """
+        if quote_client is not None:
+            self.quote_client = quote_client
+        quote_client = quote_client or self.quote_client
+
+        todo = [t for t in dict.fromkeys(tickers) if split_ticker(t)[1] in MARKETS and self._stale(t)]
+        if not todo:
+            return
+
+        resolved = {}
+        for ticker in todo:
+            try:
+                contract = self._lookup_contract(trade_client, ticker)
+            except Exception as e:
+                print(f"Contract lookup failed for {ticker}: {e}")
+                continue
+            if contract is not None:
+                resolved[ticker] = contract
+
+        lots = self._lot_sizes(quote_client, list(resolved)) if quote_client is not None and resolved else {}
+
+        entries = []
+        now = time.time()
+        for ticker, contract in resolved.items():
+            spec = MARKETS[split_ticker(ticker)[1]]
+            lot = lots.get(ticker) or getattr(contract, 'lot_size', None) or spec["lot_size"]
+            entries.append({
+                "ticker": ticker,
+                "symbol": contract.symbol,
+                "market": spec["market"],
+                "exchange": getattr(contract, 'exchange', None),
+                "currency": getattr(contract, 'currency', None) or spec["currency"],
+                "lot_size": int(lot),
+                "contract_id": getattr(contract, 'contract_id', None),
+                "resolved_at": now,
+            })
+
+        with self.lock:
+            for entry in entries:
+                self._index(entry)
+                self.contracts[entry["ticker"]] = resolved[entry["ticker"]]
+
+            with self._connect() as conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO symbols VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [tuple(e[c] for c in COLUMNS) for e in entries],
+                )
+
+    def contract(self, trade_client, ticker):
+        """
+        Tiger contract for `ticker`; resolved against the broker only on a
+        miss. Entries loaded from disk are rebuilt locally.
+        """
+        if ticker not in self.contracts:
+            if ticker not in self.by_ticker or self._stale(ticker):
+                self.prefetch(trade_client, [ticker])
+
+            entry = self.by_ticker.get(ticker)
+            if entry is None:
+                return None
+
+            from tigeropen.common.util.contract_utils import stock_contract
+            with self.lock:
+                self.contracts[ticker] = stock_contract(
+                    symbol=entry["symbol"],
+                    currency=entry["currency"],
+                    exchange=entry["exchange"],
+                    contract_id=entry["contract_id"],
+                )
+
+        return self.contracts[ticker]
+
+    def lot_size(self, ticker):
+        entry = self.by_ticker.get(ticker)
+        if entry is not None:
+            return entry["lot_size"]
+        return MARKETS.get(split_ticker(ticker)[1], MARKETS[""])["lot_size"]
+
+    def ticker_for(self, symbol, currency):
+        entry = self.by_symbol.get((symbol, currency))
+        return entry["ticker"] if entry else yfinance_ticker(symbol, currency)
+
+def round_to_lot(quantity, lot_size):
+    return (int(quantity) // lot_size) * lot_size
+
+_master = None
+_master_lock = threading.Lock()
+
+def get_symbol_master():
+    global _master
+    with _master_lock:
+        if _master is None:
+            _master = SymbolMaster()
+        return _master
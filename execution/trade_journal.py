@@ -0,0 +1,262 @@
+# execution/trade_journal.py
+
+import atexit
+import csv
+import io
+import os
+import sqlite3
+import threading
+from datetime import datetime
+import pandas as pd
+
+JOURNAL_CSV = "trade_log.csv"
+JOURNAL_DB = "trade_journal.db"
+
+# entries buffered in memory before an automatic flush
+FLUSH_EVERY = 20
+
+HEADER = ["Timestamp", "Ticker", "Action", "Quantity", "ExecutionPrice", "SignalType", "TrailingStopPct"]
+COLUMNS = ["timestamp", "ticker", "action", "quantity", "price", "signal_type", "trail_pct"]
+
+class TradeJournal:
+    """
+    Append-only trade journal. Entries are buffered and written in batches;
+    flush() appends them to the CSV, fsyncs it, then mirrors them into an
+    indexed SQLite table in one transaction. Once flush() returns, every
+    recorded trade survives a crash. Mirrored rows are keyed by their source
+    file and byte offset, so identical fills stay distinct and re-importing
+    a CSV is idempotent.
+    """
+
+    def __init__(self, csv_path=JOURNAL_CSV, db_path=JOURNAL_DB, flush_every=FLUSH_EVERY):
+        self.csv_path = csv_path
+        self.source = os.path.abspath(csv_path)
+        self.db_path = db_path
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.buffer = []
+
+        with self._connect() as conn:
+            columns = [r[1] for r in conn.execute("PRAGMA table_info(trades)")]
+            if columns and "line_offset" not in columns:
+                # the mirror is derived from the CSV: rebuild one deduplicated by row content
+                conn.execute("DROP TABLE trades")
+                conn.execute("DROP TABLE IF EXISTS meta")
+
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    line_offset INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    price REAL,
+                    signal_type TEXT,
+                    trail_pct TEXT
+                )"""
+            )
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS trades_line ON trades (source, line_offset)")
+            conn.execute("CREATE INDEX IF NOT EXISTS trades_ticker ON trades (ticker, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS trades_time ON trades (timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS trades_signal ON trades (signal_type, timestamp)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            # lines that could not be parsed, kept for inspection instead of aborting
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS quarantine (
+                    source TEXT NOT NULL,
+                    line_offset INTEGER NOT NULL,
+                    line TEXT NOT NULL,
+                    PRIMARY KEY (source, line_offset)
+                )"""
+            )
+
+        # a crash between the CSV fsync and the SQLite commit leaves a CSV tail to mirror
+        self.sync()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _mirror(self, conn, source, lines):
+        """
+        Parses (byte offset, raw line) pairs and inserts them keyed by
+        (source, offset). Unparseable lines go to the quarantine table.
+        Returns the number of new trade rows.
+        """
+        rows, rejected = [], []
+        for offset, line in lines:
+            text = line.decode(errors="replace").rstrip("\r\n")
+            fields = next(csv.reader([text]), [])
+            if not fields or fields == HEADER:
+                continue
+            try:
+                rows.append((source, offset) + parse_row(fields))
+            except (TypeError, ValueError):
+                print(f"JOURNAL: malformed line at byte {offset} of {source} quarantined.")
+                rejected.append((source, offset, text))
+
+        before = conn.total_changes
+        conn.executemany(
+            f"INSERT OR IGNORE INTO trades (source, line_offset, {', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(COLUMNS) + 2))})",
+            rows,
+        )
+        inserted = conn.total_changes - before
+        conn.executemany("INSERT OR IGNORE INTO quarantine VALUES (?, ?, ?)", rejected)
+        return inserted
+
+    def _mirrored_offset(self, conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'csv_offset'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _catch_up(self, conn):
+        # mirrors whole lines past the stored offset; a torn final line waits for its newline
+        offset = self._mirrored_offset(conn)
+        with open(self.csv_path, 'rb') as file:
+            file.seek(offset)
+            tail = file.read()
+
+        complete = tail[:tail.rfind(b"\n") + 1]
+        self._mirror(conn, self.source, split_lines(complete, offset))
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('csv_offset', ?)", (str(offset + len(complete)),))
+
+    def sync(self):
+        """
+        Mirrors CSV lines past the last mirrored byte offset into SQLite.
+        Only lines ending in a newline are consumed, so a line torn by a crash
+        never moves the offset; malformed lines are quarantined, not fatal.
+        """
+        if not os.path.isfile(self.csv_path):
+            return
+
+        with self.lock, self._connect() as conn:
+            self._catch_up(conn)
+
+    def record(self, ticker, action, quantity, price, signal_type, trail_pct="N/A", timestamp=None):
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.lock:
+            self.buffer.append([timestamp, ticker, action, quantity, price, signal_type, trail_pct])
+            due = len(self.buffer) >= self.flush_every
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Durability point: buffered entries are appended to the CSV and fsynced,
+        then mirrored into SQLite.
+        """
+        with self.lock:
+            if not self.buffer:
+                return
+            entries, self.buffer = self.buffer, []
+
+            text = io.StringIO()
+            writer = csv.writer(text)
+            if not os.path.isfile(self.csv_path) or os.path.getsize(self.csv_path) == 0:
+                writer.writerow(HEADER)
+            writer.writerows(entries)
+            data = text.getvalue().encode()
+
+            with open(self.csv_path, mode='ab') as file:
+                # terminate a line torn by a crash so it can't swallow the first new row;
+                # it is then quarantined as malformed
+                if file.tell() and not _ends_with_newline(self.csv_path):
+                    file.write(b"\r\n")
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+
+            with self._connect() as conn:
+                self._catch_up(conn)
+
+    def import_csv(self, path):
+        """
+        Loads a trade_log.csv-format file into the SQLite table. Lines already
+        imported from the same file are skipped. Returns the number of new rows.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        with self.lock, self._connect() as conn:
+            return self._mirror(conn, os.path.abspath(path), split_lines(data, 0))
+
+    def trades(self, ticker=None, start=None, end=None, signal_type=None):
+        # journal rows in time order, filtered through the SQLite indexes
+        clauses, params = [], []
+        for column, op, value in (("ticker", "=", ticker), ("timestamp", ">=", start),
+                                  ("timestamp", "<=", end), ("signal_type", "=", signal_type)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(str(value))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(COLUMNS)} FROM trades {where} ORDER BY timestamp, id",
+                conn, params=params, parse_dates=["timestamp"],
+            )
+
+    def summary(self, start=None, end=None):
+        """
+        Per-ticker fills aggregated in SQL: trade counts, net quantity, gross
+        buy/sell notional and volume-weighted average buy/sell prices.
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(str(start))
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(str(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        query = f"""
+            SELECT ticker,
+                   COUNT(*) AS Trades,
+                   SUM(CASE WHEN action = 'BUY' THEN quantity ELSE -quantity END) AS NetQuantity,
+                   SUM(CASE WHEN action = 'BUY' THEN quantity * price ELSE 0 END) AS BuyNotional,
+                   SUM(CASE WHEN action = 'SELL' THEN quantity * price ELSE 0 END) AS SellNotional,
+                   SUM(CASE WHEN action = 'BUY' THEN quantity * price END)
+                       / SUM(CASE WHEN action = 'BUY' THEN quantity END) AS AvgBuyPrice,
+                   SUM(CASE WHEN action = 'SELL' THEN quantity * price END)
+                       / SUM(CASE WHEN action = 'SELL' THEN quantity END) AS AvgSellPrice
+            FROM trades {where}
+            GROUP BY ticker
+            ORDER BY ticker
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params, index_col="ticker")
+
+    def close(self):
+        self.flush()
+
+def split_lines(data, offset):
+    # (absolute byte offset, raw line) for every line in a chunk read at `offset`
+    lines, start = [], 0
+    for line in data.splitlines(keepends=True):
+        lines.append((offset + start, line))
+        start += len(line)
+    return lines
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b"\n"
+
+def parse_row(row):
+    timestamp, ticker, action, quantity, price, signal_type, trail_pct = row
+    return (timestamp, ticker, action, int(float(quantity)), float(price), signal_type, str(trail_pct))
+
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_trade_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = TradeJournal()
+            # whatever is still buffered at interpreter exit is flushed too
+            atexit.register(_journal.close)
+        return _journal
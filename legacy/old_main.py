@@ -29,7 +29,7 @@ from analysis.portfolio_scenarios import portfolio_scenario_impact
 
 from analysis.backtest import run_backtest
 
-from analysis.drawdown import drawdown
+from analysis.performance import tearsheet, drawdowns, rolling_returns
 
 from quant.technical import get_technical_signals
 
@@ -358,100 +358,64 @@ benchmark = yf.download(
 
 benchmark = benchmark.squeeze()
 
-bench_total_return = (1 + benchmark).prod() - 1
+# PERFORMANCE ANALYSIS (one vectorized pass over strategy and benchmark)
+bt_df = pd.DataFrame({
+    "StrategyReturn": bt_returns,
+    "BenchmarkReturn": benchmark
+})
 
-print("\nBenchmark (STI):")
-print(f"Total return: {bench_total_return:.2%}")
+perf = tearsheet(bt_df, periods_per_year=12)
+strategy_stats = perf.loc["StrategyReturn"]
+bench_stats = perf.loc["BenchmarkReturn"]
 
-# DRAWDOWN ANALYSIS
-dd_series, max_dd = drawdown(bt_returns)
+print("\nBenchmark (STI):")
+print(f"Total return: {bench_stats['TotalReturn']:.2%}")
 
 print("\nDrawdown analysis:")
-print(f"Max drawdown: {max_dd:.2%}")
-
-# drawdown duration
-dd_duration = (dd_series < 0).astype(int).groupby(
-    (dd_series == 0).cumsum()
-).sum().max()
-
-print(f"Max drawdown duration (months): {dd_duration}")
-bench_dd, bench_max_dd = drawdown(benchmark)
-
-dd_series, max_dd = drawdown(bt_returns)
-
-# DRAWDOWN-ADJUSTED SHARPE
-annualised_return = (1 + bt_returns.mean())**12 - 1
-annualised_vol = bt_returns.std() * (12 ** 0.5)
-
-dd_adj_sharpe = annualised_return / (annualised_vol * abs(max_dd))
+print(f"Max drawdown: {strategy_stats['MaxDrawdown']:.2%}")
+print(f"Max drawdown duration (months): {strategy_stats['MaxDrawdownDuration']:.0f}")
 
 print("\nRisk-adjusted metrics:")
-print(f"Drawdown-adjusted Sharpe: {dd_adj_sharpe:.2f}")
+print(f"Drawdown-adjusted Sharpe: {strategy_stats['DDAdjSharpe']:.2f}")
+print(f"Sharpe: {strategy_stats['Sharpe']:.2f} | Sortino: {strategy_stats['Sortino']:.2f} | Calmar: {strategy_stats['Calmar']:.2f}")
 
 print("\nBenchmark drawdown:")
-print(f"Max drawdown: {bench_max_dd:.2%}")
-bench_dd_series, bench_max_dd = drawdown(benchmark)
-
-bench_ann_return = (1 + benchmark.mean())**12 - 1
-bench_ann_vol = benchmark.std() * (12 ** 0.5)
-
-bench_dd_adj_sharpe = bench_ann_return / (bench_ann_vol * abs(bench_max_dd))
-
-print(f"Benchmark DD-adjusted Sharpe: {bench_dd_adj_sharpe:.2f}")
+print(f"Max drawdown: {bench_stats['MaxDrawdown']:.2%}")
+print(f"Benchmark DD-adjusted Sharpe: {bench_stats['DDAdjSharpe']:.2f}")
 
 #for backtest charting
-bt_df = pd.DataFrame({
-    "StrategyReturn": bt_returns,
-    "BenchmarkReturn": benchmark
-})
+cumulative = (1 + bt_df[["StrategyReturn", "BenchmarkReturn"]].fillna(0)).cumprod()
+bt_df["StrategyCumulative"] = cumulative["StrategyReturn"]
+bt_df["BenchmarkCumulative"] = cumulative["BenchmarkReturn"]
 
-bt_df["StrategyCumulative"] = (1 + bt_df["StrategyReturn"]).cumprod()
-bt_df["BenchmarkCumulative"] = (1 + bt_df["BenchmarkReturn"]).cumprod()
-
-bt_df["StrategyDrawdown"] = (
-    bt_df["StrategyCumulative"] / bt_df["StrategyCumulative"].cummax() - 1
-)
-bt_df["BenchmarkDrawdown"] = (
-    bt_df["BenchmarkCumulative"] / bt_df["BenchmarkCumulative"].cummax() - 1
-)
+dd_paths = drawdowns(bt_df[["StrategyReturn", "BenchmarkReturn"]])
+bt_df["StrategyDrawdown"] = dd_paths["StrategyReturn"]
+bt_df["BenchmarkDrawdown"] = dd_paths["BenchmarkReturn"]
 
 # Rolling 12-month returns
-bt_df["StrategyRolling12M"] = bt_df["StrategyReturn"].rolling(12).apply(
-    lambda x: (1 + x).prod() - 1
-)
-bt_df["BenchmarkRolling12M"] = bt_df["BenchmarkReturn"].rolling(12).apply(
-    lambda x: (1 + x).prod() - 1
-)
+rolling = rolling_returns(bt_df[["StrategyReturn", "BenchmarkReturn"]], window=12)
+bt_df["StrategyRolling12M"] = rolling["StrategyReturn"]
+bt_df["BenchmarkRolling12M"] = rolling["BenchmarkReturn"]
 
 #stats table
-stats = {
-    "Metric": [
-        "Total Return",
-        "Annualised Return",
-        "Annualised Volatility",
-        "Max Drawdown",
-        "Max Drawdown Duration (months)",
-        "Drawdown-adjusted Sharpe",
-    ],
-    "Strategy": [
-        (1 + bt_returns).prod() - 1,
-        annualised_return,
-        annualised_vol,
-        max_dd,
-        dd_duration,
-        dd_adj_sharpe,
-    ],
-    "Benchmark (STI)": [
-        bench_total_return,
-        bench_ann_return,
-        bench_ann_vol,
-        bench_max_dd,
-        None,
-        bench_dd_adj_sharpe,
-    ],
+stats_metrics = {
+    "Total Return": "TotalReturn",
+    "Annualised Return": "AnnReturn",
+    "Annualised Volatility": "AnnVol",
+    "Max Drawdown": "MaxDrawdown",
+    "Max Drawdown Duration (months)": "MaxDrawdownDuration",
+    "Drawdown Recovery (months)": "RecoveryPeriods",
+    "Sharpe": "Sharpe",
+    "Sortino": "Sortino",
+    "Calmar": "Calmar",
+    "Drawdown-adjusted Sharpe": "DDAdjSharpe",
 }
 
-stats_df = pd.DataFrame(stats)
+stats_df = pd.DataFrame({
+    "Metric": list(stats_metrics),
+    "Strategy": [strategy_stats[col] for col in stats_metrics.values()],
+    "Benchmark (STI)": [bench_stats[col] for col in stats_metrics.values()],
+})
 
 print("\nSaved results to stock_screen_results.csv")
 print(df)
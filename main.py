@@ -1,108 +1,130 @@
 # main.py
-import pandas as pd
-import yfinance as yf
-from execution.broker_api import get_tiger_client
+from execution.broker_api import get_tiger_client, get_push_client
+from execution.market_data import get_price_snapshot, quote_stream
 from quant.screener_engine import run_full_screener
-from quant.intraday_signals import get_intraday_signal
-from execution.order_manager import execute_trade, get_current_quantity
-from quant.earnings_blackout import is_earnings_blackout
+from quant.screen_store import load_screen, target_weights
+from quant.data import get_price_panel
+from quant.intraday_stream import IntradayEngine
+from execution.dispatcher import OrderDispatcher
+from execution.session import TradingSession
+from execution.symbol_master import get_symbol_master, round_to_lot
+from quant.earnings_blackout import is_earnings_blackout, get_earnings_calendar
 
-def run_trading_floor():
+def run_trading_floor(rescreen=True):
     print("\n--- STARTING ---")
     
-    run_full_screener()
-    df = pd.read_csv("stock_screen_results.csv")
+    # a fresh screen is handed over in-process; otherwise the last one is memory-mapped back
+    df = run_full_screener() if rescreen else load_screen()
     
     trade_client, quote_client, account_id = get_tiger_client()
-    assets = trade_client.get_assets()
-    portfolio_value = assets[0].segments['S'].equity_with_loan
+    # assets, positions and open orders are loaded once for the whole cycle
+    session = TradingSession(trade_client, account_id)
+    portfolio_value = session.portfolio_value
+
+    # contracts and board lots for the target list, resolved once and cached on disk
+    symbols = get_symbol_master()
+    symbols.prefetch(trade_client, df['Ticker'].tolist(), quote_client)
     
-    weights = {}
-    ticker_map = {}
-    for _, row in df.iterrows():
-        sym = row['Ticker'].split('.')[0]
-        weights[sym] = row['TargetWeight']
-        ticker_map[sym] = row['Ticker']
+    weights = target_weights(df)
+
+    # one batched quote for the whole target list; every phase sizes off it
+    prices = get_price_snapshot(quote_client, df['Ticker'].tolist())
     
     # 3: Diagnostic Check
     print("\n--- PORTFOLIO CHECK: Target vs. Actual ---")
     print(f"{'Ticker':<12} | {'Target Qty':<12} | {'Actual Qty':<12} | {'Status'}")
     print("-" * 55)
 
-    # API Opti: Fetch positions once
-    current_positions = trade_client.get_positions(account=account_id)
-
     for ticker in df['Ticker'].tolist():
-        symbol_only = ticker.split('.')[0]
-        
-        latest_price = yf.Ticker(ticker).fast_info['last_price']
-        target_qty = int((portfolio_value * weights[symbol_only]) / latest_price)
-        if ".SI" in ticker: 
-            target_qty = (target_qty // 100) * 100
+        latest_price = prices.get(ticker)
+        if not latest_price:
+            print(f"{ticker:<12} | {'-':<12} | {'-':<12} | NO QUOTE")
+            continue
+        target_qty = round_to_lot((portfolio_value * weights[ticker]) / latest_price, symbols.lot_size(ticker))
         
-        actual_qty = get_current_quantity(current_positions, ticker)
+        actual_qty = session.quantity(ticker)
         
         status = "MATCH" if actual_qty == target_qty else "MISMATCH"
         print(f"{ticker:<12} | {target_qty:<12} | {actual_qty:<12} | {status}")
 
     # 4: Intraday Scan & Entry/Trim
     print("\n--- Entry & Scaling ---")
-    
-    # API Opti: Fetch positions once
-    current_positions = trade_client.get_positions(account=account_id)
-    
-    for ticker in df['Ticker'].tolist():
-        symbol_only = ticker.split('.')[0]
-        actual_qty = get_current_quantity(current_positions, ticker)
+
+    def scale_in(ticker, signal, price):
+        # scaling only tops up names already held; empty ones get CORE_INIT below
+        if session.quantity(ticker) == 0:
+            return
+        if is_earnings_blackout(ticker):
+            print(f"SKIPPING SCALING: {ticker} triggered a buy signal, but is in an Earnings Blackout.")
+            return
+
+        trigger_type = "Mean Reversion Dip" if signal == "BUY_DIP" else "VWAP Momentum Breakout"
+        print(f"SCALING TRIGGER: {ticker} hit {trigger_type}. Reconciling full delta...")
+        dispatcher.submit(ticker, weights[ticker], signal_type=signal, latest_price=price or prices.get(ticker))
+
+    # one batched 15m download seeds the streaming signal state for every name;
+    # signals tripped by live quotes afterwards go straight to scale_in
+    engine = IntradayEngine(on_signal=scale_in)
+    engine.warm(get_price_panel(df['Ticker'].tolist(), period="5d", interval="15m"))
+
+    # report dates for the universe, refreshed at most once a day; loaded before
+    # the stream opens so streamed signals see the calendar too
+    get_earnings_calendar().prefetch(df['Ticker'].tolist())
+
+    # trades for different tickers go out in parallel under the broker's rate limit;
+    # live Tiger quotes feed the engine until the cycle ends, so a name that trips
+    # a signal mid-cycle is scaled in through the same dispatcher. The dispatcher
+    # is entered first, so it exists before the first tick can arrive; leaving the
+    # block unsubscribes, then drains the dispatcher and shuts its pool down.
+    with OrderDispatcher(session) as dispatcher, \
+            quote_stream(get_push_client(), engine, df['Ticker'].tolist()):
+        for ticker in df['Ticker'].tolist():
+            actual_qty = session.quantity(ticker)
         
-        if actual_qty == 0:
-            if is_earnings_blackout(ticker):
-                print(f"SKIPPING CORE INITIALIZATION: {ticker} is in a 48-hour Earnings Blackout.")
-                continue
+            if actual_qty == 0:
+                if is_earnings_blackout(ticker):
+                    print(f"SKIPPING CORE INITIALIZATION: {ticker} is in a 48-hour Earnings Blackout.")
+                    continue
                 
-            print(f"INITIALIZING CORE: {ticker} has 0 holdings. Deploying 50% baseline.")
-            execute_trade(trade_client, account_id, ticker, (weights[symbol_only] * 0.5), actual_qty, signal_type="CORE_INIT")
-            continue
+                print(f"INITIALIZING CORE: {ticker} has 0 holdings. Deploying 50% baseline.")
+                dispatcher.submit(ticker, (weights[ticker] * 0.5), signal_type="CORE_INIT", latest_price=prices.get(ticker))
+                continue
             
-        signal = get_intraday_signal(quote_client, ticker)
+            # signals already standing from the warm-up bars
+            signal = engine.signal(ticker)
         
-        if signal in ["BUY_DIP", "BUY_MOMENTUM"]:
-            if is_earnings_blackout(ticker):
-                print(f"SKIPPING SCALING: {ticker} triggered a buy signal, but is in an Earnings Blackout.")
-                continue
-                
-            trigger_type = "Mean Reversion Dip" if signal == "BUY_DIP" else "VWAP Momentum Breakout"
-            print(f"SCALING TRIGGER: {ticker} hit {trigger_type}. Reconciling full delta...")
-            execute_trade(trade_client, account_id, ticker, weights[symbol_only], actual_qty, signal_type=signal)
+            if signal in ["BUY_DIP", "BUY_MOMENTUM"]:
+                scale_in(ticker, signal, prices.get(ticker))
             
-    # 5: Portfolio Cleanup
-    print("\n--- Validating Exits ---")
+        # positions must reflect every entry before exits are decided
+        dispatcher.drain()
+
+        # 5: Portfolio Cleanup
+        print("\n--- Validating Exits ---")
     
-    # API Opti: Fetch positions once
-    current_positions = trade_client.get_positions(account=account_id)
-    top_symbols = list(weights.keys()) 
+        # session positions already reflect this cycle's orders, no re-poll needed
+        targets = set(df['Ticker'])
 
-    for pos in current_positions:
-        raw_symbol = pos.contract.symbol.split('.')[0]
-        quantity = pos.quantity
+        exits = []
+        for raw_symbol, currency, _ in session.holdings():
+            full_ticker = symbols.ticker_for(raw_symbol, currency)
         
-        if quantity > 0 and raw_symbol not in top_symbols:
-            print(f"EXIT TRIGGER: {raw_symbol} removed from Target Universe. Liquidating.")
-            
-            full_ticker = ticker_map.get(raw_symbol)
-            if not full_ticker:
-                if raw_symbol.isdigit(): 
-                    full_ticker = f"{raw_symbol.zfill(5)}.HK"
-                elif len(raw_symbol) <= 4 and raw_symbol.isalpha(): 
-                    full_ticker = raw_symbol
-                else: 
-                    full_ticker = f"{raw_symbol}.SI"
-            
-            execute_trade(trade_client, account_id, full_ticker, 0, quantity, signal_type="CLEANUP_LIQUIDATION")
-        else:
-            if quantity > 0:
+            if full_ticker not in targets:
+                print(f"EXIT TRIGGER: {raw_symbol} removed from Target Universe. Liquidating.")
+                if full_ticker is None:
+                    print(f"ERROR: No listing known for {raw_symbol} ({currency}). Skipping exit.")
+                    continue
+                exits.append(full_ticker)
+            else:
                 print(f"HOLD: {raw_symbol} maintains Model Ranking.")
 
+        # names outside the target list join the snapshot in one more batched quote
+        if exits:
+            prices.update(get_price_snapshot(quote_client, exits))
+
+        for full_ticker in exits:
+            dispatcher.submit(full_ticker, 0, signal_type="CLEANUP_LIQUIDATION", latest_price=prices.get(full_ticker))
+
     print("\n--- CYCLE COMPLETE ---")
 
 if __name__ == "__main__":
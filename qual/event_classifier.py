@@ -1,3 +1,5 @@
+from qual.keyword_matcher import headline_hits
+
 ORDER_KEYWORDS = [
     "order",
     "contract",
@@ -30,16 +32,14 @@ EVENT_KEYWORDS = {
 }
 
 def classify_event(headline: str):
-    h = headline.lower()
+    labels = {label for label, _ in headline_hits(headline)}
 
-    for kw in ORDER_KEYWORDS:
-        if kw in h:
-            return "order_win"
+    if "order_win" in labels:
+        return "order_win"
 
-    for event, keywords in EVENT_KEYWORDS.items():
-        for kw in keywords:
-            if kw in h:
-                return event
+    for event in EVENT_KEYWORDS:
+        if event in labels:
+            return event
 
     return "noise"
 
@@ -0,0 +1,96 @@
+# qual/keyword_matcher.py
+
+import re
+import threading
+from functools import lru_cache
+
+# hyphens split words ("government-linked" -> government, linked), so a
+# hyphenated keyword such as "spin-off" is matched as a token sequence;
+# apostrophes stay inside the token for the possessive folding below
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+# (ending, characters to strip) folding inflections back onto a keyword,
+# e.g. "orders" -> "order", "acquired" -> "acquire". A bare "d" is only
+# dropped from "-ed" endings so "wind" does not become "win".
+SUFFIXES = (("ing", 3), ("es", 2), ("ed", 2), ("s", 1), ("ed", 1))
+
+# endings after which a doubled final consonant is undone ("winning" -> "win")
+DOUBLING_SUFFIXES = ("ing", "ed")
+VOWELS = set("aeiou")
+
+class KeywordMatcher:
+    """
+    Whole-word, multi-phrase keyword matcher. Keywords are tokenized once into
+    a phrase table; a headline is tokenized and scanned in a single pass,
+    returning every (label, keyword) hit, including overlapping phrases such
+    as "contract" and "contract win". Matching respects word boundaries, so
+    "win" no longer fires on "winter".
+    """
+
+    def __init__(self, labelled_keywords):
+        self.phrases = {}
+        for label, keyword in labelled_keywords:
+            phrase = tuple(TOKEN_PATTERN.findall(keyword.lower()))
+            self.phrases.setdefault(phrase, set()).add((label, keyword))
+
+        self.vocabulary = {token for phrase in self.phrases for token in phrase}
+        self.max_length = max((len(p) for p in self.phrases), default=0)
+        self.normalize = lru_cache(maxsize=65536)(self._normalize)
+
+    def _normalize(self, token):
+        if token in self.vocabulary:
+            return token
+        # possessives fold onto the noun ("government's" -> "government")
+        if token.endswith("'s"):
+            token = token[:-2]
+            if token in self.vocabulary:
+                return token
+        for ending, strip in SUFFIXES:
+            if token.endswith(ending) and len(token) > len(ending) + 1:
+                stem = token[:-strip]
+                if stem in self.vocabulary:
+                    return stem
+                if (ending in DOUBLING_SUFFIXES and len(stem) > 2
+                        and stem[-1] == stem[-2] and stem[-1] not in VOWELS
+                        and stem[:-1] in self.vocabulary):
+                    return stem[:-1]
+        return token
+
+    def match(self, text):
+        tokens = [self.normalize(t) for t in TOKEN_PATTERN.findall(text.lower())]
+        hits = set()
+
+        for i in range(len(tokens)):
+            if tokens[i] not in self.vocabulary:
+                continue
+            for length in range(1, self.max_length + 1):
+                labels = self.phrases.get(tuple(tokens[i:i + length]))
+                if labels:
+                    hits |= labels
+
+        return frozenset(hits)
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_headline_matcher():
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            # imported here: both keyword modules import this one
+            from qual.event_classifier import ORDER_KEYWORDS, EVENT_KEYWORDS
+            from analysis.catalyst_score import CATALYST_KEYWORDS
+
+            keywords = [("order_win", kw) for kw in ORDER_KEYWORDS]
+            keywords += [(event, kw) for event, kws in EVENT_KEYWORDS.items() for kw in kws]
+            keywords += [("catalyst", kw) for kw in CATALYST_KEYWORDS]
+            _matcher = KeywordMatcher(keywords)
+        return _matcher
+
+@lru_cache(maxsize=65536)
+def headline_hits(headline):
+    """
+    All keyword hits for one headline, computed once and shared by the event
+    classifier and the catalyst scorer.
+    """
+    return get_headline_matcher().match(headline)
@@ -1,12 +1,87 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 
-client = OpenAI()
+LLM_MODEL = "gpt-4o-mini"
+SUMMARY_CACHE = "llm_summary_cache.db"
+MAX_IN_FLIGHT = 4
 
-def summarize_events(ticker, headlines):
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    # OpenAI() honours OPENAI_BASE_URL, so a local stub server can stand in
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI()
+        return _client
+
+def set_client(client):
     """
-    Returns a concise analyst-style summary of material events.
+    Swaps the chat client used by default. Anything exposing
+    `chat.completions.create(...)` works, e.g. a stub for tests or benchmarks.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+def summary_key(ticker, model, headlines):
+    payload = json.dumps([ticker, model, sorted(headlines)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SummaryCache:
     """
-    prompt = f"""
+    Summaries keyed by (ticker, model, hash of the sorted headlines), so an
+    unchanged headline set never costs another completion.
+    """
+
+    def __init__(self, path=SUMMARY_CACHE):
+        self.path = path
+        self.lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    ticker TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, ticker, model, summary):
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)",
+                (key, ticker, model, summary, time.time()),
+            )
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_summary_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SummaryCache()
+        return _cache
+
+def build_prompt(ticker, headlines):
+    return f"""
 You are a financial analyst.
 
 Summarize the following recent news headlines for {ticker}.
@@ -19,13 +94,42 @@ Be factual, neutral, and concise.
 Headlines:
 """ + "\n".join(f"- {h}" for h in headlines)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
+def summarize_events(ticker, headlines, client=None, model=LLM_MODEL):
+    """
+    Returns a concise analyst-style summary of material events.
+    """
+    cache = get_summary_cache()
+    key = summary_key(ticker, model, headlines)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    response = (client or get_client()).chat.completions.create(
+        model=model,
         messages=[
             {"role": "system", "content": "You are a buy-side equity research analyst."},
-            {"role": "user", "content": prompt},
+            {"role": "user", "content": build_prompt(ticker, headlines)},
         ],
         temperature=0.2,
     )
 
-    return response.choices[0].message.content.strip()
\ No newline at end of file
+    summary = response.choices[0].message.content.strip()
+    cache.put(key, ticker, model, summary)
+    return summary
+
+def summarize_many(headlines_by_ticker, client=None, model=LLM_MODEL, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Summarizes several tickers concurrently with at most `max_in_flight`
+    completions outstanding. Returns {ticker: summary or None on failure}.
+    """
+    def summarize(item):
+        ticker, headlines = item
+        try:
+            return ticker, summarize_events(ticker, headlines, client=client, model=model)
+        except Exception as e:
+            print(f"LLM failed for {ticker}: {e}")
+            return ticker, None
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        return dict(pool.map(summarize, headlines_by_ticker.items()))
@@ -1,9 +1,162 @@
 #scraper for yahoofinance news
 
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
 import feedparser
+import httpx
+
+FEED_URL = "https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US"
+NEWS_CACHE = "news_cache.db"
+MAX_CONCURRENT_FEEDS = 16
+
+def feed_url(ticker):
+    return FEED_URL.format(ticker=ticker)
+
+def headline_key(headline):
+    # content hash of the normalized title; identical stories share one key across tickers
+    normalized = " ".join(headline.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+class HeadlineStore:
+    """
+    Persists each feed's validators (ETag / Last-Modified) and its headlines.
+    Headlines are stored once per content hash; a feed only keeps the ordered
+    list of hashes it contained, so stories syndicated under several tickers
+    are parsed and stored a single time.
+    """
+
+    def __init__(self, path=NEWS_CACHE):
+        self.path = path
+        self.lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS feeds (
+                    ticker TEXT PRIMARY KEY,
+                    etag TEXT,
+                    modified TEXT,
+                    keys TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS headlines (
+                    key TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    first_seen REAL NOT NULL
+                )"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def feed_state(self, tickers):
+        marks = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT ticker, etag, modified, keys FROM feeds WHERE ticker IN ({marks})",
+                list(tickers),
+            ).fetchall()
+        return {ticker: (etag, modified, json.loads(keys)) for ticker, etag, modified, keys in rows}
+
+    def titles(self, keys):
+        if not keys:
+            return {}
+        marks = ",".join("?" * len(keys))
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT key, title FROM headlines WHERE key IN ({marks})", list(keys)).fetchall()
+        return dict(rows)
+
+    def save_feeds(self, updates):
+        """
+        updates: {ticker: (etag, modified, [(key, title), ...])}
+        """
+        now = time.time()
+        feed_rows = []
+        headline_rows = {}
+
+        for ticker, (etag, modified, items) in updates.items():
+            feed_rows.append((ticker, etag, modified, json.dumps([k for k, _ in items]), now))
+            for key, title in items:
+                headline_rows.setdefault(key, (key, title, now))
+
+        with self.lock, self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO headlines VALUES (?, ?, ?)", list(headline_rows.values()))
+            conn.executemany("INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)", feed_rows)
+
+async def _fetch_feed(client, semaphore, ticker, state):
+    etag, modified, keys = state if state else (None, None, None)
+
+    headers = {}
+    if keys is not None:
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+    async with semaphore:
+        response = await client.get(feed_url(ticker), headers=headers)
+
+    if response.status_code == 304:
+        return ticker, None
+
+    response.raise_for_status()
+    feed = feedparser.parse(response.content)
+    items = [(headline_key(entry.title), entry.title) for entry in feed.entries if entry.get("title")]
+    return ticker, (response.headers.get("ETag"), response.headers.get("Last-Modified"), items)
+
+async def fetch_headlines_async(tickers, limit=10, max_concurrency=MAX_CONCURRENT_FEEDS, store=None):
+    """
+    Pulls every ticker's RSS feed concurrently with conditional GETs.
+    Unchanged feeds (304) and failed requests are answered from the store.
+    Returns {ticker: [headline, ...]} in feed order; a ticker whose request
+    failed with nothing stored yet is left out, so callers can fall back.
+    """
+    store = store or HeadlineStore()
+    tickers = list(dict.fromkeys(tickers))
+    state = store.feed_state(tickers)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with httpx.AsyncClient(
+        timeout=10, follow_redirects=True, headers={"User-Agent": "Mozilla/5.0"}
+    ) as client:
+        tasks = [_fetch_feed(client, semaphore, t, state.get(t)) for t in tickers]
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+    updates = {}
+    feed_keys = {}
+    for ticker, response in zip(tickers, responses):
+        if isinstance(response, Exception):
+            print(f"News fetch failed for {ticker}: {response}")
+            if ticker not in state:
+                continue
+            response = (ticker, None)
+
+        _, fresh = response
+        if fresh is not None:
+            updates[ticker] = fresh
+            feed_keys[ticker] = [key for key, _ in fresh[2]]
+        else:
+            feed_keys[ticker] = state.get(ticker, (None, None, []))[2]
+
+    if updates:
+        store.save_feeds(updates)
+
+    titles = store.titles({key for keys in feed_keys.values() for key in keys[:limit]})
+    return {
+        ticker: [titles[key] for key in keys[:limit] if key in titles]
+        for ticker, keys in feed_keys.items()
+    }
+
+def fetch_all_headlines(tickers, limit=10):
+    return asyncio.run(fetch_headlines_async(tickers, limit=limit))
 
 def get_headlines(ticker, limit=10):
-    url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US"
+    url = feed_url(ticker)
 
     feed = feedparser.parse(url)
 
@@ -12,4 +165,3 @@ def get_headlines(ticker, limit=10):
         headlines.append(entry.title)
 
     return headlines
-
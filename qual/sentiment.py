@@ -1,14 +1,111 @@
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from qual.event_classifier import classify_event
 from qual.event_weights import EVENT_WEIGHTS
+from qual.scrape_news import headline_key
 
 analyzer = SentimentIntensityAnalyzer()
 
-def sentiment_score(headlines):
-    weighted_scores = []
-    total_weight = 0.0
-    event_count = 0
+SENTIMENT_CACHE = "sentiment_cache.db"
+BATCH_SIZE = 500
+
+class SentimentCache:
+    """
+    VADER compound scores keyed by the normalized headline hash, kept in
+    memory for the run and persisted to SQLite across runs.
+    """
+
+    def __init__(self, path=SENTIMENT_CACHE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.memory = {}
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS scores (
+                    key TEXT PRIMARY KEY,
+                    compound REAL NOT NULL
+                ) WITHOUT ROWID"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys):
+        with self.lock:
+            found = {k: self.memory[k] for k in keys if k in self.memory}
+
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        if missing:
+            with self._connect() as conn:
+                for start in range(0, len(missing), BATCH_SIZE):
+                    chunk = missing[start:start + BATCH_SIZE]
+                    marks = ",".join("?" * len(chunk))
+                    rows = conn.execute(f"SELECT key, compound FROM scores WHERE key IN ({marks})", chunk).fetchall()
+                    found.update(rows)
+
+            with self.lock:
+                self.memory.update(found)
+
+        return found
+
+    def put_many(self, scores):
+        with self.lock:
+            self.memory.update(scores)
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?)", list(scores.items()))
 
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_sentiment_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SentimentCache()
+        return _cache
+
+def _score_batch(headlines):
+    return [analyzer.polarity_scores(h)["compound"] for h in headlines]
+
+def score_many(headlines, processes=None, batch_size=BATCH_SIZE):
+    """
+    Returns VADER compound scores for `headlines`, in order. Headlines seen
+    before are served from the cache; misses are scored in batches, across
+    a process pool when `processes` is set (useful for large backfills), and
+    written back after each batch.
+    """
+    cache = get_sentiment_cache()
+    keys = [headline_key(h) for h in headlines]
+    scores = cache.get_many(keys)
+
+    pending = {}
+    for key, h in zip(keys, headlines):
+        if key not in scores:
+            pending.setdefault(key, h)
+
+    if pending:
+        items = list(pending.items())
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        texts = [[h for _, h in batch] for batch in batches]
+
+        if processes and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = pool.map(_score_batch, texts)
+                for batch, batch_scores in zip(batches, results):
+                    cache.put_many({k: s for (k, _), s in zip(batch, batch_scores)})
+        else:
+            for batch, batch_texts in zip(batches, texts):
+                cache.put_many({k: s for (k, _), s in zip(batch, _score_batch(batch_texts))})
+
+        scores = cache.get_many(keys)
+
+    return [scores[k] for k in keys]
+
+def sentiment_score(headlines):
+    weighted = []
     for h in headlines:
         event = classify_event(h)
         weight = EVENT_WEIGHTS.get(event, 0.0)
@@ -16,14 +113,13 @@ def sentiment_score(headlines):
         if weight == 0.0:
             continue
 
-        sentiment = analyzer.polarity_scores(h)["compound"]
-        weighted_scores.append(sentiment * weight)
-        total_weight += weight
-        event_count += 1
+        weighted.append((h, weight))
 
-    if total_weight == 0:
+    if not weighted:
         return 0.0, 0
 
-    avg_sentiment = sum(weighted_scores) / total_weight
-    return avg_sentiment, event_count
+    sentiments = score_many([h for h, _ in weighted])
+    total_weight = sum(w for _, w in weighted)
 
+    avg_sentiment = sum(s * w for s, (_, w) in zip(sentiments, weighted)) / total_weight
+    return avg_sentiment, len(weighted)
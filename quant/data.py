@@ -1,6 +1,95 @@
 #returning stock information and data
+import threading
 import yfinance as yf
+import pandas as pd
+from quant.price_store import get_price_store
+from quant.info_cache import InfoCache
 
-def get_info(ticker):
+def fetch_info(ticker):
     stock = yf.Ticker(ticker)
-    return stock.info
\ No newline at end of file
+    return stock.info
+
+_info_cache = None
+_info_cache_lock = threading.Lock()
+
+def get_info_cache():
+    global _info_cache
+    with _info_cache_lock:
+        if _info_cache is None:
+            _info_cache = InfoCache(fetch_info)
+        return _info_cache
+
+def get_info(ticker, fields=None):
+    """
+    Returns the ticker's .info dict from the shared fundamentals cache.
+    `fields` names the keys the caller relies on and picks the freshness
+    required (see quant.info_cache.FIELD_TTLS); stale data is served while
+    a background refresh runs.
+    """
+    return get_info_cache().get(ticker, fields)
+
+def period_offset(period):
+    # translate a yfinance period string ("90d", "3mo", "1y") into a date offset
+    if period.endswith("mo"):
+        return pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("d"):
+        return pd.DateOffset(days=int(period[:-1]))
+    if period.endswith("y"):
+        return pd.DateOffset(years=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+def trim_period(frame, period):
+    # keep only the trailing `period` of a date-indexed frame
+    if frame is None or frame.empty:
+        return frame
+    cutoff = frame.index[-1] - period_offset(period)
+    return frame[frame.index > cutoff]
+
+def get_price_panel(tickers, period="1y", interval="1d"):
+    """
+    Returns OHLCV bars for the whole universe with (field, ticker) MultiIndex
+    columns, e.g. panel["Close"][ticker]. Daily bars come from the local price
+    store, which only downloads what it is missing; other intervals are
+    fetched in one batched request.
+    """
+    try:
+        if interval == "1d":
+            start = pd.Timestamp.today().normalize() - period_offset(period)
+            return get_price_store().load(tickers, start)
+
+        panel = yf.download(
+            list(tickers),
+            period=period,
+            interval=interval,
+            auto_adjust=True,
+            progress=False,
+            threads=True,
+        )
+    except Exception as e:
+        print(f"Bulk price download failed: {e}")
+        return pd.DataFrame()
+
+    if panel is None:
+        return pd.DataFrame()
+    return panel
+
+def last_close(panel, ticker):
+    # latest close for `ticker` in a universe panel, None if it has none
+    if panel is None or panel.empty or ticker not in panel["Close"].columns:
+        return None
+    closes = panel["Close"][ticker].dropna()
+    return float(closes.iloc[-1]) if not closes.empty else None
+
+def get_ticker_history(panel, ticker, period=None):
+    """
+    Slices one ticker's OHLCV history out of a universe panel, shaped like
+    yf.Ticker(ticker).history(). Returns None if the panel has no column for
+    the ticker so callers can fall back to their own download.
+    """
+    if panel is None or panel.empty or ticker not in panel.columns.get_level_values(1):
+        return None
+
+    hist = panel.xs(ticker, axis=1, level=1).dropna(subset=["Close"])
+    if period:
+        hist = trim_period(hist, period)
+    return hist
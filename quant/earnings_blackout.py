@@ -1,35 +1,164 @@
 # quant/earnings_blackout.py
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 
+EARNINGS_CACHE = "earnings_cache.db"
+
+DAY = 24 * 60 * 60
+# report dates rarely move; a calendar this old is still trusted if a refresh fails
+MAX_STALE = 7 * DAY
+# a ticker whose lookup failed is not retried before this, however often it is asked for
+RETRY_FAILED_AFTER = 60 * 60
+PREFETCH_WORKERS = 8
+
+def fetch_earnings_dates(ticker):
+    # upcoming and recent report times as UTC epoch seconds; [] if Yahoo has none
+    earnings_dates = yf.Ticker(ticker).get_earnings_dates(limit=5)
+    if earnings_dates is None or earnings_dates.empty:
+        return []
+    index = pd.DatetimeIndex(earnings_dates.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return [ts.timestamp() for ts in index]
+
+class EarningsCalendar:
+    """
+    Persistent earnings calendar for the universe. Report dates are
+    prefetched at most once a day and held per ticker as a sorted list, so a
+    blackout check is a bisect. A ticker whose dates could not be fetched is
+    reported as unknown rather than as clear, and the failure is remembered
+    for RETRY_FAILED_AFTER so Yahoo is not asked again on every call.
+    """
+
+    def __init__(self, fetch=fetch_earnings_dates, path=EARNINGS_CACHE):
+        self.fetch = fetch
+        self.path = path
+        self.lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS reports (
+                    ticker TEXT NOT NULL,
+                    report_at REAL NOT NULL,
+                    PRIMARY KEY (ticker, report_at)
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS fetches (
+                    ticker TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS failures (
+                    ticker TEXT PRIMARY KEY,
+                    failed_at REAL NOT NULL
+                )"""
+            )
+            fetched = dict(conn.execute("SELECT ticker, fetched_at FROM fetches").fetchall())
+            failed = dict(conn.execute("SELECT ticker, failed_at FROM failures").fetchall())
+            reports = conn.execute("SELECT ticker, report_at FROM reports ORDER BY ticker, report_at").fetchall()
+
+        self.fetched_at = fetched
+        self.failed_at = failed
+        self.reports = {ticker: [] for ticker in fetched}
+        for ticker, report_at in reports:
+            self.reports.setdefault(ticker, []).append(report_at)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _fetch_one(self, ticker):
+        try:
+            return ticker, sorted(self.fetch(ticker))
+        except Exception as e:
+            print(f"Earnings lookup failed for {ticker}: {e}")
+            return ticker, None
+
+    def prefetch(self, tickers, max_workers=PREFETCH_WORKERS):
+        """
+        Refreshes every ticker whose calendar is missing or over a day old.
+        Failed fetches keep the previous calendar and are not retried until
+        RETRY_FAILED_AFTER has passed.
+        """
+        now = time.time()
+        due = [
+            t for t in dict.fromkeys(tickers)
+            if now - self.fetched_at.get(t, 0) > DAY and now - self.failed_at.get(t, 0) > RETRY_FAILED_AFTER
+        ]
+        if not due:
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            fetched = list(pool.map(self._fetch_one, due))
+        results = [(t, dates) for t, dates in fetched if dates is not None]
+        failures = [t for t, dates in fetched if dates is None]
+
+        with self.lock:
+            with self._connect() as conn:
+                for ticker, dates in results:
+                    conn.execute("DELETE FROM reports WHERE ticker = ?", (ticker,))
+                    conn.executemany("INSERT OR IGNORE INTO reports VALUES (?, ?)", [(ticker, d) for d in dates])
+                    conn.execute("INSERT OR REPLACE INTO fetches VALUES (?, ?)", (ticker, now))
+                    conn.execute("DELETE FROM failures WHERE ticker = ?", (ticker,))
+                conn.executemany("INSERT OR REPLACE INTO failures VALUES (?, ?)", [(t, now) for t in failures])
+
+            for ticker, dates in results:
+                self.reports[ticker] = dates
+                self.fetched_at[ticker] = now
+                self.failed_at.pop(ticker, None)
+            for ticker in failures:
+                self.failed_at[ticker] = now
+
+    def next_report(self, ticker, now=None):
+        """
+        Next report time (UTC epoch seconds) at or after `now`, None if none is
+        scheduled. Raises LookupError if the calendar for `ticker` is unknown
+        or too stale to trust.
+        """
+        now = time.time() if now is None else now
+        if now - self.fetched_at.get(ticker, 0) > MAX_STALE:
+            raise LookupError(f"no current earnings calendar for {ticker}")
+
+        dates = self.reports.get(ticker, [])
+        i = bisect_left(dates, now)
+        return dates[i] if i < len(dates) else None
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+def get_earnings_calendar():
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = EarningsCalendar()
+        return _calendar
+
 def is_earnings_blackout(ticker, blackout_hours=48):
+    # answered from the calendar prefetched once per cycle; a ticker it does
+    # not cover is treated as unknown, never looked up here
     try:
-        stock = yf.Ticker(ticker)
-        # Fetch upcoming and recent earnings dates
-        earnings_dates = stock.get_earnings_dates(limit=5)
-        
-        if earnings_dates is None or earnings_dates.empty:
-            return False
-            
-        now = datetime.now(timezone.utc)
-        
-        # Filter strictly for future earnings
-        future_earnings = earnings_dates[earnings_dates.index > now]
-        
-        if not future_earnings.empty:
-            # Isolate the absolute next earnings date
-            next_date = future_earnings.index.min()
-            time_to_earnings = next_date - now
-            
-            # Check if the event falls within the blackout threshold
-            if timedelta(hours=0) <= time_to_earnings <= timedelta(hours=blackout_hours):
-                formatted_date = next_date.strftime('%Y-%m-%d %H:%M UTC')
-                print(f"BLACKOUT ACTIVE: {ticker} reports earnings on {formatted_date}.")
-                return True
-                
-    except Exception as e:
-        # If the API fails to fetch dates, default to False to avoid halting the entire system
-        print(f"Earnings lookup failed for {ticker}: {e}")
-        
-    return False
\ No newline at end of file
+        next_report = get_earnings_calendar().next_report(ticker)
+    except LookupError:
+        # without a calendar the blackout cannot be ruled out, so stay out
+        print(f"BLACKOUT ASSUMED: earnings calendar unavailable for {ticker}.")
+        return True
+
+    if next_report is None:
+        return False
+
+    next_date = datetime.fromtimestamp(next_report, timezone.utc)
+    time_to_earnings = next_date - datetime.now(timezone.utc)
+
+    # Check if the event falls within the blackout threshold
+    if timedelta(hours=0) <= time_to_earnings <= timedelta(hours=blackout_hours):
+        formatted_date = next_date.strftime('%Y-%m-%d %H:%M UTC')
+        print(f"BLACKOUT ACTIVE: {ticker} reports earnings on {formatted_date}.")
+        return True
+
+    return False
@@ -0,0 +1,370 @@
+# quant/indicator_state.py
+
+import io
+import math
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from quant.indicators import (
+    MA_FAST, MA_SLOW, RSI_WINDOW, ATR_WINDOW, VOL_WINDOW, TRADING_DAYS,
+    right_align, true_range, wilder,
+)
+
+INDICATOR_STATE = "indicator_state.db"
+
+# closes differing by more than this at the last stored bar mean the history
+# was revised (splits, dividend adjustment) and the state is rebuilt
+REVISION_TOLERANCE = 1e-6
+
+# ring buffer -> window; every buffer takes one value per bar except
+# "returns", which starts at a ticker's second bar
+WINDOWS = {
+    "closes": MA_SLOW,
+    "gains": RSI_WINDOW,
+    "losses": RSI_WINDOW,
+    "trs": ATR_WINDOW,
+    "returns": VOL_WINDOW,
+}
+# Wilder averages: key -> window
+SMOOTHED = {"gain": RSI_WINDOW, "loss": RSI_WINDOW, "atr": ATR_WINDOW}
+
+NO_DATE = np.datetime64("NaT", "D")
+
+def _back(buf, count, k):
+    """
+    k-th most recent value (1 = newest) of every row of a (rows x window)
+    ring buffer that has taken `count` pushes; NaN where fewer than k.
+    The slot a row writes next is count % window, so no position is stored.
+    """
+    value = buf[np.arange(len(buf)), (count - k) % buf.shape[1]]
+    return np.where(count >= k, value, np.nan)
+
+def _recent_sum(buf, count, k):
+    # sum of each row's last min(count, k) ring values
+    back = np.arange(1, k + 1)
+    values = np.take_along_axis(buf, (count[:, None] - back) % buf.shape[1], axis=1)
+    return np.where(back <= count[:, None], values, 0.0).sum(axis=1)
+
+class IndicatorState:
+    """
+    Rolling indicator state for a whole universe, held as (ticker x window)
+    NumPy ring buffers of the last closes, RSI gains/losses, true ranges and
+    returns, plus their running window sums, Wilder's RSI/ATR averages, bar
+    counts and last bar dates. update() advances every ticker with a bar on
+    one panel row in a single vectorized step; peek() evaluates a provisional
+    bar without changing the state.
+    """
+
+    def __init__(self, tickers=(), arrays=None):
+        arrays = arrays or {}
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+
+        self.buffers = {name: arrays.get(name, np.zeros((n, window))) for name, window in WINDOWS.items()}
+        self.bars = arrays.get("bars", np.zeros(n, dtype=np.int64))
+        self.last_date = arrays.get("last_date", np.full(n, NO_DATE))
+        self.wilder = {key: arrays.get(f"wilder_{key}", np.full(n, np.nan)) for key in SMOOTHED}
+
+        # running sums are rebuilt from the buffers, so float drift never persists
+        self.sums = self._window_sums(np.arange(n))
+
+    def _window_sums(self, rows):
+        bars = self.bars[rows]
+        n_returns = np.maximum(bars - 1, 0)
+        closes = self.buffers["closes"][rows]
+        returns = self.buffers["returns"][rows]
+        return {
+            "ma_fast": _recent_sum(closes, bars, MA_FAST),
+            "ma_slow": _recent_sum(closes, bars, MA_SLOW),
+            "gain": _recent_sum(self.buffers["gains"][rows], bars, RSI_WINDOW),
+            "loss": _recent_sum(self.buffers["losses"][rows], bars, RSI_WINDOW),
+            "tr": _recent_sum(self.buffers["trs"][rows], bars, ATR_WINDOW),
+            "ret": _recent_sum(returns, n_returns, VOL_WINDOW),
+            "ret_sq": _recent_sum(returns ** 2, n_returns, VOL_WINDOW),
+        }
+
+    def add(self, tickers):
+        """
+        Row numbers of `tickers`, appending empty rows for new ones.
+        """
+        new = [t for t in dict.fromkeys(tickers) if t not in self.index]
+        if new:
+            k = len(new)
+            for name, window in WINDOWS.items():
+                self.buffers[name] = np.vstack([self.buffers[name], np.zeros((k, window))])
+            self.bars = np.concatenate([self.bars, np.zeros(k, dtype=np.int64)])
+            self.last_date = np.concatenate([self.last_date, np.full(k, NO_DATE)])
+            for key in SMOOTHED:
+                self.wilder[key] = np.concatenate([self.wilder[key], np.full(k, np.nan)])
+            for key in self.sums:
+                self.sums[key] = np.concatenate([self.sums[key], np.zeros(k)])
+            for ticker in new:
+                self.index[ticker] = len(self.tickers)
+                self.tickers.append(ticker)
+
+        return np.array([self.index[t] for t in tickers], dtype=np.intp)
+
+    def last_close(self, rows):
+        return _back(self.buffers["closes"][rows], self.bars[rows], 1)
+
+    def seed(self, rows, high, low, close, dates):
+        """
+        Rebuilds `rows` from (dates x tickers) history arrays with the
+        vectorized helpers. Each column is right-aligned on its valid closes
+        first, so gaps behave as they do in compute_indicators.
+        """
+        valid = ~np.isnan(close)
+        c, order = right_align(close, valid)
+        h = np.take_along_axis(high, order, axis=0)
+        l = np.take_along_axis(low, order, axis=0)
+        h[np.isnan(c)] = np.nan
+        l[np.isnan(c)] = np.nan
+
+        delta = np.full(c.shape, np.nan)
+        delta[1:] = c[1:] - c[:-1]
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+        gains[np.isnan(c)] = np.nan
+        losses[np.isnan(c)] = np.nan
+        trs = true_range(h, l, c)
+        returns = np.full(c.shape, np.nan)
+        returns[1:] = c[1:] / c[:-1] - 1
+
+        length, width = c.shape
+        bars = valid.sum(axis=0)
+        columns = np.arange(width)
+        for name, values, count in (("closes", c, bars), ("gains", gains, bars), ("losses", losses, bars),
+                                    ("trs", trs, bars), ("returns", returns, np.maximum(bars - 1, 0))):
+            window = WINDOWS[name]
+            back = np.arange(1, min(window, length) + 1)
+            held = back[:, None] <= count[None, :]
+            buf = np.zeros((width, window))
+            # the k-th newest of `count` pushes sits in slot (count - k) % window
+            buf[columns[None, :], (count[None, :] - back[:, None]) % window] = np.where(held, values[length - back], 0.0)
+            self.buffers[name][rows] = buf
+
+        for key, values in (("gain", gains), ("loss", losses), ("atr", trs)):
+            self.wilder[key][rows] = wilder(values, SMOOTHED[key])[-1] if length else np.nan
+
+        last_valid = length - 1 - np.argmax(valid[::-1], axis=0)
+        self.bars[rows] = bars
+        self.last_date[rows] = np.where(bars > 0, dates[last_valid], NO_DATE)
+        for key, value in self._window_sums(rows).items():
+            self.sums[key][rows] = value
+
+    def _step(self, rows, high, low, close):
+        # everything one more bar would change for `rows`, without touching the state
+        bars = self.bars[rows]
+        closes = self.buffers["closes"][rows]
+        prev = _back(closes, bars, 1)
+        has_prev = bars > 0
+
+        delta = close - prev
+        gain = np.where(has_prev, np.maximum(delta, 0.0), 0.0)
+        loss = np.where(has_prev, np.maximum(-delta, 0.0), 0.0)
+        tr = np.where(has_prev, np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev))), high - low)
+        ret = np.where(has_prev, close / prev - 1, np.nan)
+
+        n_returns = np.maximum(bars - 1, 0)
+        old_return = np.nan_to_num(_back(self.buffers["returns"][rows], n_returns, VOL_WINDOW))
+
+        sums = {key: value[rows] for key, value in self.sums.items()}
+        sums["ma_fast"] = sums["ma_fast"] + close - np.nan_to_num(_back(closes, bars, MA_FAST))
+        sums["ma_slow"] = sums["ma_slow"] + close - np.nan_to_num(_back(closes, bars, MA_SLOW))
+        sums["gain"] = sums["gain"] + gain - np.nan_to_num(_back(self.buffers["gains"][rows], bars, RSI_WINDOW))
+        sums["loss"] = sums["loss"] + loss - np.nan_to_num(_back(self.buffers["losses"][rows], bars, RSI_WINDOW))
+        sums["tr"] = sums["tr"] + tr - np.nan_to_num(_back(self.buffers["trs"][rows], bars, ATR_WINDOW))
+        sums["ret"] = sums["ret"] + np.where(has_prev, ret - old_return, 0.0)
+        sums["ret_sq"] = sums["ret_sq"] + np.where(has_prev, ret * ret - old_return * old_return, 0.0)
+
+        bars = bars + 1
+        smoothed = {}
+        for key, value, total in (("gain", gain, sums["gain"]), ("loss", loss, sums["loss"]), ("atr", tr, sums["tr"])):
+            window = SMOOTHED[key]
+            avg = self.wilder[key][rows]
+            # Wilder's average starts from the first full simple window
+            start = np.where(bars >= window, total / window, np.nan)
+            smoothed[key] = np.where(np.isnan(avg), start, avg + (value - avg) / window)
+
+        return (gain, loss, tr, ret), sums, smoothed, bars
+
+    def update(self, rows, date, high, low, close):
+        """
+        Appends one bar dated `date` to every ticker in `rows` (unique row
+        numbers) at once.
+        """
+        pushes = self.bars[rows]
+        (gain, loss, tr, ret), sums, smoothed, bars = self._step(rows, high, low, close)
+
+        for name, value in (("closes", close), ("gains", gain), ("losses", loss), ("trs", tr)):
+            self.buffers[name][rows, pushes % WINDOWS[name]] = value
+        started = pushes > 0
+        self.buffers["returns"][rows[started], (pushes[started] - 1) % VOL_WINDOW] = ret[started]
+
+        for key, value in sums.items():
+            self.sums[key][rows] = value
+        for key, value in smoothed.items():
+            self.wilder[key][rows] = value
+        self.bars[rows] = bars
+        self.last_date[rows] = date
+
+    def _snapshot(self, close, sums, smoothed, bars, smoothing):
+        if smoothing == "wilder":
+            avg_gain, avg_loss, atr = smoothed["gain"], smoothed["loss"], smoothed["atr"]
+        elif smoothing == "sma":
+            avg_gain = np.where(bars >= RSI_WINDOW, sums["gain"] / RSI_WINDOW, np.nan)
+            avg_loss = np.where(bars >= RSI_WINDOW, sums["loss"] / RSI_WINDOW, np.nan)
+            atr = np.where(bars >= ATR_WINDOW, sums["tr"] / ATR_WINDOW, np.nan)
+        else:
+            raise ValueError(f"Unknown smoothing: {smoothing}")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.where(avg_loss == 0, 100, avg_gain / avg_loss)
+        var = (sums["ret_sq"] - sums["ret"] ** 2 / VOL_WINDOW) / (VOL_WINDOW - 1)
+
+        return {
+            "Close": close,
+            "Bars": bars,
+            "MA50": np.where(bars >= MA_FAST, sums["ma_fast"] / MA_FAST, np.nan),
+            "MA200": np.where(bars >= MA_SLOW, sums["ma_slow"] / MA_SLOW, np.nan),
+            "RSI14": 100 - (100 / (1 + rs)),
+            "ATR14": atr,
+            "Vol30": np.where(bars - 1 >= VOL_WINDOW, np.sqrt(np.maximum(var, 0.0)) * math.sqrt(TRADING_DAYS), np.nan),
+        }
+
+    def snapshot(self, rows, smoothing="sma"):
+        """
+        Indicator frame for `rows`, shaped like compute_indicators' output.
+        """
+        sums = {key: value[rows] for key, value in self.sums.items()}
+        smoothed = {key: value[rows] for key, value in self.wilder.items()}
+        columns = self._snapshot(self.last_close(rows), sums, smoothed, self.bars[rows], smoothing)
+        return pd.DataFrame(columns, index=pd.Index([self.tickers[r] for r in rows]))
+
+    def peek(self, ticker, high, low, close, smoothing="sma"):
+        """
+        Indicators for one ticker as they would read with a provisional (e.g.
+        intraday) bar appended. The state itself is left unchanged.
+        """
+        if ticker not in self.index:
+            return None
+        rows = np.array([self.index[ticker]])
+        _, sums, smoothed, bars = self._step(rows, np.array([high]), np.array([low]), np.array([close]))
+        columns = self._snapshot(np.array([close]), sums, smoothed, bars, smoothing)
+        return {key: value[0].item() for key, value in columns.items()}
+
+    def to_arrays(self):
+        arrays = {name: buf for name, buf in self.buffers.items()}
+        arrays.update({f"wilder_{key}": value for key, value in self.wilder.items()})
+        arrays.update(tickers=np.array(self.tickers, dtype=str), bars=self.bars, last_date=self.last_date)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        arrays = dict(arrays)
+        tickers = arrays.pop("tickers").tolist()
+        return cls(tickers, arrays)
+
+class IndicatorStore:
+    """
+    Universe IndicatorState persisted between runs as one NumPy archive.
+    refresh() applies only the panel rows newer than each ticker's stored
+    state, one vectorized step per row, and returns the same indicator frame
+    as quant.indicators.compute_indicators.
+    """
+
+    def __init__(self, path=INDICATOR_STATE):
+        self.path = path
+        self.lock = threading.Lock()
+
+        with self._connect() as conn:
+            # per-ticker JSON rows written by earlier versions are not read back
+            conn.execute("DROP TABLE IF EXISTS indicator_state")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS indicator_arrays (
+                    name TEXT PRIMARY KEY,
+                    payload BLOB NOT NULL
+                )"""
+            )
+            row = conn.execute("SELECT payload FROM indicator_arrays WHERE name = 'universe'").fetchone()
+
+        if row is None:
+            self.state = IndicatorState()
+        else:
+            with np.load(io.BytesIO(row[0]), allow_pickle=False) as archive:
+                self.state = IndicatorState.from_arrays(archive)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def refresh(self, panel, smoothing="sma"):
+        """
+        Advances every ticker in a (field, ticker) daily panel to its last bar
+        and persists the new state. Tickers without stored state, whose
+        stored last bar left the panel, or whose history was revised are
+        seeded from the panel in one NumPy pass.
+        """
+        closes = panel["Close"]
+        closes = closes.loc[:, closes.notna().any().to_numpy()]
+        if closes.empty:
+            return pd.DataFrame()
+
+        tickers = list(closes.columns)
+        close = closes.to_numpy(dtype=float)
+        high = panel["High"].reindex(columns=tickers).to_numpy(dtype=float)
+        low = panel["Low"].reindex(columns=tickers).to_numpy(dtype=float)
+        dates = pd.DatetimeIndex(panel.index).tz_localize(None).normalize().to_numpy().astype("datetime64[D]")
+        length = len(dates)
+
+        state = self.state
+        known = np.array([t in state.index for t in tickers])
+        rows = state.add(tickers)
+
+        # continue only from a bar the panel still holds, unchanged
+        last = state.last_date[rows]
+        at = np.searchsorted(dates, last)
+        clipped = np.minimum(at, length - 1)
+        columns = np.arange(len(tickers))
+        at_last = close[clipped, columns]
+        stored = state.last_close(rows)
+        with np.errstate(invalid="ignore"):
+            held = known & (at < length) & (dates[clipped] == last) & ~np.isnan(at_last)
+            revised = np.abs(at_last - stored) > REVISION_TOLERANCE * np.abs(stored)
+        advancing = held & ~revised
+
+        changed = ~advancing
+        if changed.any():
+            seeded = np.flatnonzero(changed)
+            state.seed(rows[seeded], high[:, seeded], low[:, seeded], close[:, seeded], dates)
+
+        first = at[advancing].min() + 1 if advancing.any() else length
+        for t in range(first, length):
+            live = np.flatnonzero(advancing & (at < t) & ~np.isnan(close[t]))
+            if len(live):
+                state.update(rows[live], dates[t], high[t, live], low[t, live], close[t, live])
+                changed[live] = True
+
+        if changed.any():
+            self.save()
+        return state.snapshot(rows, smoothing)
+
+    def peek(self, ticker, high, low, close, smoothing="sma"):
+        return self.state.peek(ticker, high, low, close, smoothing)
+
+    def save(self):
+        buffer = io.BytesIO()
+        np.savez(buffer, **self.state.to_arrays())
+        with self.lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO indicator_arrays VALUES ('universe', ?)", (buffer.getvalue(),))
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_indicator_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IndicatorStore()
+        return _store
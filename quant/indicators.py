@@ -0,0 +1,165 @@
+# quant/indicators.py
+
+import numpy as np
+import pandas as pd
+
+MA_FAST = 50
+MA_SLOW = 200
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+VOL_WINDOW = 30
+TRADING_DAYS = 252
+
+def right_align(values, valid=None):
+    """
+    Moves every column's valid rows to the bottom of a (dates x tickers)
+    array, keeping their order, so each column reads like that ticker's own
+    gap-free history (what dropna() gave the per-ticker code). `valid` picks
+    the rows to keep; it defaults to the non-NaN entries of `values`.
+    Returns the aligned array and the row order, to align sibling fields.
+    """
+    valid = ~np.isnan(values) if valid is None else valid
+    order = np.argsort(valid, axis=0, kind="stable")
+    return np.take_along_axis(values, order, axis=0), order
+
+def rolling_sum(values, window):
+    # trailing window sums from one cumulative sum; NaN until `window` valid rows
+    filled = np.where(np.isnan(values), 0.0, values)
+    sums = np.cumsum(filled, axis=0)
+    counts = np.cumsum(~np.isnan(values), axis=0)
+
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+
+    total = sums[window - 1:].copy()
+    total[1:] -= sums[:-window]
+    n = counts[window - 1:].copy()
+    n[1:] -= counts[:-window]
+
+    out[window - 1:] = np.where(n == window, total, np.nan)
+    return out
+
+def rolling_mean(values, window):
+    return rolling_sum(values, window) / window
+
+def rolling_std(values, window, ddof=1):
+    # sample std from rolling sums of x and x^2, centred per column for accuracy
+    valid = ~np.isnan(values)
+    centre = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+    x = values - centre
+    s1 = rolling_sum(x, window)
+    s2 = rolling_sum(x ** 2, window)
+    var = (s2 - s1 ** 2 / window) / (window - ddof)
+    return np.sqrt(np.maximum(var, 0.0))
+
+def wilder(values, window):
+    """
+    Wilder smoothing down every column at once: seeded with the simple mean
+    of the first `window` valid rows, then avg = avg + (x - avg) / window.
+    """
+    out = np.full(values.shape, np.nan)
+    seed = rolling_mean(values, window)
+    avg = np.full(values.shape[1:], np.nan)
+
+    for t in range(len(values)):
+        started = ~np.isnan(avg)
+        avg = np.where(started, avg + (values[t] - avg) / window, seed[t])
+        out[t] = avg
+    return out
+
+def smooth(values, window, smoothing):
+    if smoothing == "wilder":
+        return wilder(values, window)
+    if smoothing == "sma":
+        return rolling_mean(values, window)
+    raise ValueError(f"Unknown smoothing: {smoothing}")
+
+def rsi(close, window=RSI_WINDOW, smoothing="sma"):
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+
+    # the first delta counts as flat, as delta.where(delta > 0, 0) had it
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[np.isnan(close)] = np.nan
+    loss[np.isnan(close)] = np.nan
+
+    avg_gain = smooth(gain, window, smoothing)
+    avg_loss = smooth(loss, window, smoothing)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.where(avg_loss == 0, 100, avg_gain / avg_loss)
+    return 100 - (100 / (1 + rs))
+
+def true_range(high, low, close):
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[1:] = close[:-1]
+    # fmax skips NaN, so the first bar's range is just high - low
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def atr(high, low, close, window=ATR_WINDOW, smoothing="sma"):
+    return smooth(true_range(high, low, close), window, smoothing)
+
+def compute_indicators(panel, smoothing="sma"):
+    """
+    Latest technical indicators for every ticker in a (field, ticker) daily
+    panel, computed in one pass over (dates x tickers) arrays. Each column is
+    right-aligned on its valid closes first, so gaps behave as they did per
+    ticker. Returns one row per ticker: Close, Bars, MA50, MA200, RSI14,
+    ATR14 and annualized 30-day volatility (Vol30). The default "sma"
+    smoothing reproduces the per-ticker functions; "wilder" switches RSI and
+    ATR to Wilder's averages.
+    """
+    close = panel["Close"]
+    tickers = close.columns
+    values = close.to_numpy(dtype=float)
+
+    valid = ~np.isnan(values)
+    c, order = right_align(values, valid)
+    h = np.take_along_axis(panel["High"].reindex(columns=tickers).to_numpy(dtype=float), order, axis=0)
+    l = np.take_along_axis(panel["Low"].reindex(columns=tickers).to_numpy(dtype=float), order, axis=0)
+    h[np.isnan(c)] = np.nan
+    l[np.isnan(c)] = np.nan
+
+    returns = np.full(c.shape, np.nan)
+    returns[1:] = c[1:] / c[:-1] - 1
+
+    def last(frame):
+        return frame[-1] if len(frame) else np.full(len(tickers), np.nan)
+
+    return pd.DataFrame({
+        "Close": last(c),
+        "Bars": valid.sum(axis=0),
+        "MA50": last(rolling_mean(c, MA_FAST)),
+        "MA200": last(rolling_mean(c, MA_SLOW)),
+        "RSI14": last(rsi(c, RSI_WINDOW, smoothing)),
+        "ATR14": last(atr(h, l, c, ATR_WINDOW, smoothing)),
+        "Vol30": last(rolling_std(returns, VOL_WINDOW)) * np.sqrt(TRADING_DAYS),
+    }, index=tickers)
+
+def technical_overlay(indicators):
+    """
+    Vectorized get_technical_signals / get_volatility_multiplier over an
+    indicator frame: Trend, RSI, TechScore and BaseVolMultiplier per ticker.
+    """
+    price, ma50, ma200 = indicators["Close"], indicators["MA50"], indicators["MA200"]
+
+    bull = (price > ma50) & (ma50 > ma200)
+    bear = (price < ma50) & (ma50 < ma200)
+    weak_bull = price > ma200
+    trend = np.select([bull, bear, weak_bull], ["Strong Bullish", "Strong Bearish", "Weak Bullish"], "Weak Bearish")
+    score = np.select([bull, bear, weak_bull], [2, -2, 1], -1)
+
+    rsi_now = indicators["RSI14"]
+    score = score + np.where(rsi_now < 30, 1, np.where(rsi_now > 70, -1, 0))
+
+    # the 200-day average needs 200 bars; the per-ticker code bailed out below that
+    enough = indicators["Bars"] >= MA_SLOW
+    vol = indicators["Vol30"]
+
+    return pd.DataFrame({
+        "Trend": np.where(enough, trend, "Insufficient Data"),
+        "RSI": np.where(enough, rsi_now.round(2), 50),
+        "TechScore": np.where(enough, score, 0),
+        "BaseVolMultiplier": np.select([vol > 0.60, vol > 0.40], [0.5, 0.75], 1.0),
+    }, index=indicators.index)
@@ -0,0 +1,149 @@
+# quant/info_cache.py
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, time as clock, timedelta
+from zoneinfo import ZoneInfo
+
+INFO_CACHE = "info_cache.db"
+
+DAY = 24 * 60 * 60
+SESSION = 6 * 60 * 60  # roughly one trading session
+
+# how long each `.info` field may be served before a refresh is due;
+# fields not listed here (ratios, sector, names) use DEFAULT_TTL
+FIELD_TTLS = {
+    "previousClose": SESSION,
+    "currentPrice": SESSION,
+    "averageVolume": DAY,
+}
+DEFAULT_TTL = DAY
+
+# intraday price fields that roll over when the exchange closes: once a
+# session close has passed since the fetch they are refetched synchronously,
+# never served stale. Callers that only need slow-moving fields (volumes,
+# ratios, names) should not ask for these, so they keep the cached copy.
+PRICE_FIELDS = ("previousClose", "currentPrice")
+
+# yfinance suffix -> exchange time zone and regular-session close
+SESSION_CLOSE = {
+    "": ("America/New_York", clock(16, 0)),
+    "SI": ("Asia/Singapore", clock(17, 0)),
+    "HK": ("Asia/Hong_Kong", clock(16, 0)),
+    "NS": ("Asia/Kolkata", clock(15, 30)),
+}
+
+def last_session_close(ticker, now=None):
+    """
+    Epoch time of the most recent weekday session close on the ticker's
+    exchange (holidays are not modelled, which only costs an extra refetch).
+    """
+    zone, close = SESSION_CLOSE.get(ticker.partition(".")[2].upper(), SESSION_CLOSE[""])
+    local = datetime.fromtimestamp(time.time() if now is None else now, ZoneInfo(zone))
+    boundary = datetime.combine(local.date(), close, local.tzinfo)
+    if boundary > local:
+        boundary -= timedelta(days=1)
+    while boundary.weekday() >= 5:
+        boundary -= timedelta(days=1)
+    return boundary.timestamp()
+
+class InfoCache:
+    """
+    Persistent cache of yf.Ticker(ticker).info payloads with per-field TTLs.
+
+    Lookups are stale-while-revalidate: an expired entry is returned straight
+    away and a single background refresh per ticker is started. A ticker that
+    has never been fetched blocks the caller, as does a request for
+    PRICE_FIELDS once the exchange has closed a session since the fetch.
+    """
+
+    def __init__(self, fetch, path=INFO_CACHE):
+        self.fetch = fetch
+        self.path = path
+        self.lock = threading.Lock()
+        self.memory = {}
+        self.refreshing = set()
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS info (
+                    ticker TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL,
+                    payload TEXT NOT NULL
+                )"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _load(self, ticker):
+        with self.lock:
+            if ticker in self.memory:
+                return self.memory[ticker]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at, payload FROM info WHERE ticker = ?", (ticker,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        entry = (row[0], json.loads(row[1]))
+        with self.lock:
+            self.memory[ticker] = entry
+        return entry
+
+    def _store(self, ticker, info):
+        entry = (time.time(), info)
+        payload = json.dumps(info, default=str)
+
+        with self.lock:
+            self.memory[ticker] = entry
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO info VALUES (?, ?, ?)", (ticker, entry[0], payload))
+        return entry
+
+    def _refresh(self, ticker):
+        try:
+            info = self.fetch(ticker)
+            if info:
+                self._store(ticker, info)
+        except Exception as e:
+            # keep serving the stale copy; the next lookup will try again
+            print(f"Background info refresh failed for {ticker}: {e}")
+        finally:
+            with self.lock:
+                self.refreshing.discard(ticker)
+
+    def _revalidate(self, ticker):
+        with self.lock:
+            if ticker in self.refreshing:
+                return
+            self.refreshing.add(ticker)
+        threading.Thread(target=self._refresh, args=(ticker,), daemon=True).start()
+
+    def get(self, ticker, fields=None):
+        entry = self._load(ticker)
+
+        if entry is None:
+            return self._store(ticker, self.fetch(ticker))[1]
+
+        fetched_at, info = entry
+        fields = fields or ()
+
+        if any(f in PRICE_FIELDS for f in fields) and fetched_at < last_session_close(ticker):
+            try:
+                return self._store(ticker, self.fetch(ticker))[1]
+            except Exception as e:
+                print(f"Info refresh failed for {ticker}, serving the cached copy: {e}")
+                return info
+
+        ttl = min((FIELD_TTLS.get(f, DEFAULT_TTL) for f in fields), default=DEFAULT_TTL)
+
+        if time.time() - fetched_at > ttl:
+            self._revalidate(ticker)
+
+        return info
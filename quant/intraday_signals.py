@@ -1,6 +1,7 @@
 # quant/intraday_signals.py
 import numpy as np
 import yfinance as yf
+from quant.data import get_info
 
 def get_intraday_signal(quote_client, ticker):
     try:
@@ -10,7 +11,7 @@ def get_intraday_signal(quote_client, ticker):
         if hist.empty: return "NO_DATA"
 
         current_price = hist['Close'].iloc[-1]
-        prev_close = stock.info.get('previousClose', current_price)
+        prev_close = get_info(ticker, fields=("previousClose",)).get('previousClose', current_price)
         
         # volatility calculation
         returns = hist['Close'].pct_change().dropna()
@@ -0,0 +1,200 @@
+# quant/intraday_stream.py
+
+import math
+from collections import deque
+import pandas as pd
+
+BAR_MINUTES = 15
+# about five sessions of 15-minute returns, the window get_intraday_signal used
+RETURN_WINDOW = 130
+DIP_SIGMA = 2.0
+VOLUME_SURGE = 1.5
+
+class TickerState:
+    """
+    Streaming intraday state for one ticker. Completed bars feed a ring
+    buffer of close-to-close returns with a sliding Welford mean/variance, and
+    the session's running VWAP and volume sums. A bar still being built from
+    ticks is folded in provisionally, so every update is O(1).
+    """
+
+    def __init__(self, window=RETURN_WINDOW):
+        self.returns = deque(maxlen=window)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+        self.day = None
+        self.last_close = None
+        self.prev_close = None
+        self.pv_sum = 0.0
+        self.volume_sum = 0.0
+        self.bars_today = 0
+
+        self.bar = None
+        self.bar_start = None
+        self.signal = None
+
+    def _push_return(self, value):
+        if len(self.returns) == self.returns.maxlen:
+            old = self.returns[0]
+            # sliding Welford: drop the oldest return before adding the new one
+            if self.count == 1:
+                self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            else:
+                delta = old - self.mean
+                self.mean -= delta / (self.count - 1)
+                self.m2 -= delta * (old - self.mean)
+                self.count -= 1
+
+        self.returns.append(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def volatility(self):
+        # sample std of bar returns, as pandas .std() computed it
+        if self.count < 2:
+            return float("nan")
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    def _roll_day(self, day):
+        if day != self.day:
+            if self.day is not None:
+                self.prev_close = self.last_close
+            self.day = day
+            self.pv_sum = 0.0
+            self.volume_sum = 0.0
+            self.bars_today = 0
+
+    def add_bar(self, time, high, low, close, volume):
+        """
+        Folds one completed bar into the state and returns the signal for it.
+        """
+        self._roll_day(time.date())
+
+        if self.last_close:
+            self._push_return(close / self.last_close - 1)
+        self.last_close = close
+
+        volume = volume if volume == volume else 0.0
+        self.pv_sum += (high + low + close) / 3 * volume
+        self.volume_sum += volume
+        self.bars_today += 1
+
+        return self.evaluate(close, volume)
+
+    def add_tick(self, time, price, size):
+        """
+        Folds one trade into the bar being built. The previous bar is closed
+        when the tick starts a new BAR_MINUTES bucket.
+        """
+        start = time.floor(f"{BAR_MINUTES}min")
+        if self.bar is not None and start != self.bar_start:
+            self.add_bar(self.bar_start, *self.bar[1:])
+            self.bar = None
+
+        if self.bar is None:
+            self.bar_start = start
+            self.bar = [price, price, price, price, 0.0]
+            self._roll_day(start.date())
+        else:
+            self.bar[1] = max(self.bar[1], price)
+            self.bar[2] = min(self.bar[2], price)
+            self.bar[3] = price
+        self.bar[4] += size
+
+        _, high, low, close, volume = self.bar
+        return self.evaluate(price, volume, partial=((high + low + close) / 3 * volume, volume))
+
+    def evaluate(self, price, recent_volume, partial=None):
+        reference = self.prev_close or self.last_close
+        if not reference:
+            return None
+
+        pv_sum, volume_sum, bars = self.pv_sum, self.volume_sum, self.bars_today
+        if partial:
+            pv_sum += partial[0]
+            volume_sum += partial[1]
+            bars += 1
+
+        vwap = pv_sum / volume_sum if volume_sum > 0 else price
+        avg_volume = volume_sum / bars if bars else 0.0
+        change_pct = (price - reference) / reference
+
+        is_breakout = price > vwap and recent_volume > avg_volume * VOLUME_SURGE
+
+        if change_pct < -DIP_SIGMA * self.volatility:
+            return "BUY_DIP"
+        if is_breakout and change_pct > 0:
+            return "BUY_MOMENTUM"
+        return "MONITOR"
+
+class IntradayEngine:
+    """
+    Watches a whole universe from a bar or tick feed. Each update is O(1) per
+    ticker and `on_signal(ticker, signal, price)` fires the moment a ticker
+    trips BUY_DIP or BUY_MOMENTUM (once per trip, not on every bar while the
+    condition holds).
+    """
+
+    def __init__(self, on_signal=None, window=RETURN_WINDOW):
+        self.on_signal = on_signal
+        self.window = window
+        self.states = {}
+
+    def state(self, ticker):
+        if ticker not in self.states:
+            self.states[ticker] = TickerState(self.window)
+        return self.states[ticker]
+
+    def _emit(self, ticker, signal, price):
+        state = self.states[ticker]
+        tripped = signal != state.signal and signal in ("BUY_DIP", "BUY_MOMENTUM")
+        state.signal = signal
+        if tripped and self.on_signal:
+            self.on_signal(ticker, signal, price)
+        return signal
+
+    def on_bar(self, ticker, time, high, low, close, volume):
+        signal = self.state(ticker).add_bar(time, high, low, close, volume)
+        return self._emit(ticker, signal, close)
+
+    def on_tick(self, ticker, time, price, size):
+        signal = self.state(ticker).add_tick(time, price, size)
+        return self._emit(ticker, signal, price)
+
+    def warm(self, panel):
+        """
+        Seeds every ticker from a (field, ticker) bar panel, e.g.
+        get_price_panel(tickers, period="5d", interval="15m"), without
+        emitting signals for the historical bars.
+        """
+        on_signal, self.on_signal = self.on_signal, None
+        try:
+            replay(self, panel)
+        finally:
+            self.on_signal = on_signal
+
+    def signal(self, ticker):
+        state = self.states.get(ticker)
+        return state.signal if state and state.signal else "NO_DATA"
+
+def replay(engine, panel):
+    """
+    Local stand-in for the live feed: plays a (field, ticker) bar panel into
+    the engine in timestamp order.
+    """
+    if panel is None or panel.empty:
+        return
+
+    tickers = panel["Close"].columns
+    high, low, close = (panel[f].reindex(columns=tickers).to_numpy() for f in ("High", "Low", "Close"))
+    volume = panel["Volume"].reindex(columns=tickers).fillna(0).to_numpy()
+
+    for i, time in enumerate(pd.DatetimeIndex(panel.index)):
+        for j, ticker in enumerate(tickers):
+            if close[i, j] == close[i, j]:
+                engine.on_bar(ticker, time, high[i, j], low[i, j], close[i, j], volume[i, j])
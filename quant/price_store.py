@@ -0,0 +1,215 @@
+# quant/price_store.py
+
+import sqlite3
+import threading
+import pandas as pd
+import yfinance as yf
+
+PRICE_STORE = "price_cache.db"
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+# a re-downloaded last bar whose adjusted close moved by more than this means
+# Yahoo rebased the history (dividend, split) and the ticker is refetched
+REVISION_TOLERANCE = 1e-6
+
+class PriceStore:
+    """
+    On-disk daily OHLCV cache (SQLite, one row per ticker per day).
+
+    `load` tops the store up incrementally: tickers already covered from the
+    requested start only re-download from their last cached bar, so a daily
+    run pulls roughly one new bar per name instead of a full year. Every
+    fetch joins onto the cached range, so a ticker's bars stay contiguous
+    from its first requested date to its last cached bar.
+
+    Bars are stored auto-adjusted as Yahoo returned them. The re-downloaded
+    last bar doubles as a corporate-action check: if its adjusted close no
+    longer matches the cached one, the ticker is invalidated and refetched.
+    """
+
+    def __init__(self, path=PRICE_STORE):
+        self.path = path
+        self.lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS bars (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (ticker, date)
+                ) WITHOUT ROWID"""
+            )
+            # earliest date each ticker has been requested from, so names that
+            # listed after `start` are not re-downloaded in full every run
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS coverage (
+                    ticker TEXT PRIMARY KEY,
+                    first_requested TEXT NOT NULL
+                )"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def coverage(self, tickers):
+        """
+        Returns {ticker: (first_requested, last_cached_date)} for cached tickers.
+        """
+        marks = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""SELECT c.ticker, c.first_requested, MAX(b.date)
+                    FROM coverage c LEFT JOIN bars b ON b.ticker = c.ticker
+                    WHERE c.ticker IN ({marks})
+                    GROUP BY c.ticker""",
+                list(tickers),
+            ).fetchall()
+        return {ticker: (first, last) for ticker, first, last in rows}
+
+    def last_closes(self, tickers):
+        # {ticker: (date, close)} of each ticker's last cached bar
+        marks = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""SELECT b.ticker, b.date, b.close FROM bars b
+                    JOIN (SELECT ticker, MAX(date) AS date FROM bars
+                          WHERE ticker IN ({marks}) GROUP BY ticker) m
+                    ON b.ticker = m.ticker AND b.date = m.date""",
+                list(tickers),
+            ).fetchall()
+        return {ticker: (date, close) for ticker, date, close in rows}
+
+    def update(self, tickers, start, end=None):
+        """
+        Downloads only the bars missing from the store. Tickers that need the
+        same date range are fetched together in one batched request.
+        """
+        start = pd.Timestamp(start).strftime("%Y-%m-%d")
+        end = pd.Timestamp(end).strftime("%Y-%m-%d") if end is not None else None
+        cached = self.coverage(tickers)
+
+        groups = {}
+        for ticker in tickers:
+            first_requested, last_date = cached.get(ticker, (None, None))
+            if first_requested is None or last_date is None:
+                window = (start, end)
+            elif first_requested > start:
+                # extend backwards up to the cached range, never leaving a hole before it
+                window = (start, None if end is None else max(end, first_requested))
+            else:
+                # re-request the last cached bar so a partial session bar is replaced;
+                # a cache ending before `start` is filled forward from it too
+                window = (last_date, end)
+            groups.setdefault(window, []).append(ticker)
+
+        last = self.last_closes(tickers)
+        revised = []
+        for (fetch_from, fetch_end), batch in groups.items():
+            if fetch_end is not None and fetch_from >= fetch_end:
+                continue
+            try:
+                raw = yf.download(
+                    batch,
+                    start=fetch_from,
+                    end=fetch_end,
+                    interval="1d",
+                    auto_adjust=True,
+                    progress=False,
+                    threads=True,
+                )
+            except Exception as e:
+                print(f"Price store refresh failed for {len(batch)} tickers: {e}")
+                continue
+
+            rebased = _rebased(raw, batch, last)
+            revised.extend(rebased)
+            self.write(raw, [t for t in batch if t not in rebased], fetch_from)
+
+        if revised:
+            print(f"Price store: adjusted history changed for {len(revised)} tickers, refetching.")
+            self.invalidate(revised)
+            self.update(revised, start, end)
+
+    def write(self, raw, tickers, requested_from):
+        rows = []
+        if raw is not None and not raw.empty and tickers:
+            bars = raw.stack(level=1, future_stack=True).dropna(subset=["Close"])[FIELDS]
+            bars = bars[bars.index.get_level_values(1).isin(tickers)]
+            dates = bars.index.get_level_values(0).strftime("%Y-%m-%d")
+            names = bars.index.get_level_values(1)
+            values = bars.astype(float).to_numpy().tolist()
+            rows = [(ticker, date, *bar) for ticker, date, bar in zip(names, dates, values)]
+
+        with self.lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany(
+                """INSERT INTO coverage VALUES (?, ?)
+                   ON CONFLICT(ticker) DO UPDATE
+                   SET first_requested = MIN(first_requested, excluded.first_requested)""",
+                [(ticker, requested_from) for ticker in tickers],
+            )
+
+    def read(self, tickers, start, end=None):
+        """
+        Returns cached bars as a panel shaped like yf.download output:
+        a date index and (field, ticker) MultiIndex columns.
+        """
+        start = pd.Timestamp(start).strftime("%Y-%m-%d")
+        end = pd.Timestamp(end).strftime("%Y-%m-%d") if end is not None else "9999-12-31"
+        marks = ",".join("?" * len(tickers))
+
+        with self._connect() as conn:
+            bars = pd.read_sql_query(
+                f"""SELECT ticker, date, open, high, low, close, volume FROM bars
+                    WHERE ticker IN ({marks}) AND date >= ? AND date < ?""",
+                conn,
+                params=[*tickers, start, end],
+            )
+
+        if bars.empty:
+            return pd.DataFrame()
+
+        bars.columns = ["Ticker", "Date"] + FIELDS
+        bars["Date"] = pd.to_datetime(bars["Date"])
+        panel = bars.pivot(index="Date", columns="Ticker", values=FIELDS)
+        panel.columns.names = ["Price", "Ticker"]
+        return panel.sort_index()
+
+    def load(self, tickers, start, end=None):
+        tickers = list(dict.fromkeys(tickers))
+        self.update(tickers, start, end)
+        return self.read(tickers, start, end)
+
+    def invalidate(self, tickers):
+        marks = ",".join("?" * len(tickers))
+        with self.lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM bars WHERE ticker IN ({marks})", list(tickers))
+            conn.execute(f"DELETE FROM coverage WHERE ticker IN ({marks})", list(tickers))
+
+def _rebased(raw, tickers, last):
+    # tickers whose freshly downloaded close at the last cached date differs from the cache
+    if raw is None or raw.empty:
+        return []
+
+    closes = raw["Close"]
+    dates = closes.index.strftime("%Y-%m-%d")
+    rebased = []
+    for ticker in tickers:
+        if ticker not in last or ticker not in closes.columns:
+            continue
+        date, cached = last[ticker]
+        fresh = closes[ticker][dates == date].dropna()
+        if not fresh.empty and abs(fresh.iloc[-1] - cached) > REVISION_TOLERANCE * abs(cached):
+            rebased.append(ticker)
+    return rebased
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_price_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PriceStore()
+        return _store
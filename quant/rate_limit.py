@@ -0,0 +1,40 @@
+# quant/rate_limit.py
+
+import threading
+import time
+
+class RateLimiter:
+    """
+    Thread-safe token bucket. Every caller shares one requests-per-second
+    budget; `burst` tokens may be spent back to back after an idle period.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        # requests larger than the bucket are drawn in capacity-sized chunks,
+        # since the bucket can never hold them at once
+        while tokens > 0:
+            chunk = min(tokens, self.capacity)
+            self._take(chunk)
+            tokens -= chunk
+
+    def _take(self, tokens):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+
+                wait = (tokens - self.tokens) / self.rate
+
+            time.sleep(wait)
@@ -0,0 +1,70 @@
+# quant/screen_store.py
+
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+SCREEN_FILE = "stock_screen_results.feather"
+SCREEN_CSV = "stock_screen_results.csv"
+
+# column types of run_full_screener's output; nullable numerics (dividend
+# yield, average daily value) stay null instead of turning into strings
+SCREEN_SCHEMA = pa.schema([
+    ("CompanyName", pa.string()),
+    ("Ticker", pa.string()),
+    ("Sector", pa.string()),
+    ("QuantScore", pa.int64()),
+    ("QualScore", pa.int64()),
+    ("CatalystScore", pa.float64()),
+    ("OrderScore", pa.int64()),
+    ("GovScore", pa.int64()),
+    ("ValuationScore", pa.float64()),
+    ("AdjValuationScore", pa.float64()),
+    ("DividendYield", pa.float64()),
+    ("Decision", pa.string()),
+    ("DecisionRationale", pa.string()),
+    ("PassedFactors", pa.string()),
+    ("RiskFlags", pa.string()),
+    ("ScenarioTriggers", pa.string()),
+    ("CatalystTriggers", pa.string()),
+    ("AvgDailyValue", pa.float64()),
+    ("Turnaround", pa.bool_()),
+    ("TechScore", pa.int64()),
+    ("Trend", pa.string()),
+    ("RSI", pa.float64()),
+    ("VolMultiplier", pa.float64()),
+    ("QuantWeighted", pa.float64()),
+    ("QualWeighted", pa.float64()),
+    ("DividendAdj", pa.float64()),
+    ("BaseVolMultiplier", pa.float64()),
+    ("PortfolioScore", pa.float64()),
+    ("DividendTilt", pa.float64()),
+    ("AdjPortfolioScore", pa.float64()),
+    ("LiquidityCap", pa.float64()),
+    ("TargetWeight", pa.float64()),
+])
+
+def save_screen(df, path=SCREEN_FILE, csv_path=SCREEN_CSV):
+    """
+    Persists a screen as an uncompressed Feather (Arrow IPC) file typed by
+    SCREEN_SCHEMA, so it can be memory-mapped back, plus the usual CSV.
+    """
+    table = pa.Table.from_pandas(
+        df.reindex(columns=SCREEN_SCHEMA.names),
+        schema=SCREEN_SCHEMA,
+        preserve_index=False,
+    )
+    feather.write_feather(table, path, compression="uncompressed")
+    df.to_csv(csv_path, index=False)
+
+def load_screen(path=SCREEN_FILE, csv_path=SCREEN_CSV):
+    # memory-mapped Arrow read; screens saved before the Feather file existed come from the CSV
+    if os.path.isfile(path):
+        return feather.read_feather(path, memory_map=True)
+    return pd.read_csv(csv_path)
+
+def target_weights(df):
+    # {ticker: TargetWeight} keyed by the full yfinance ticker, so D05.SI and a
+    # US or HK "D05" never share a weight; broker symbols are derived at order time
+    return dict(zip(df["Ticker"], df["TargetWeight"]))
@@ -1,14 +1,15 @@
 # quant/screener_engine.py
 
-import time
 import pandas as pd
 import os
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 
-from quant.data import get_info
+from quant.data import get_info, get_price_panel, get_ticker_history, last_close
+from quant.rate_limit import RateLimiter
 from quant.ratios import extract_ratios
 from quant.score_quant import score_quant
-from qual.scrape_news import get_headlines
+from qual.scrape_news import get_headlines, fetch_all_headlines
 from qual.sentiment import sentiment_score
 from qual.score_qual import score_qual
 from quant.sector_rules import SECTOR_RULES, DEFAULT_RULES
@@ -25,6 +26,9 @@ from analysis.portfolio_scenarios import portfolio_scenario_impact
 from analysis.backtest import run_backtest
 from analysis.drawdown import drawdown
 from quant.technical import get_technical_signals
+from quant.indicators import technical_overlay
+from quant.indicator_state import get_indicator_store
+from quant.screen_store import save_screen
 from analysis.volatility import get_volatility_multiplier
 from analysis.gov_exposure import gov_spend_sensitivity
 from analysis.turnaround import turnaround_flag
@@ -32,9 +36,30 @@ from analysis.order_momentum import order_momentum
 from analysis.liquidity import liquidity_cap
 from analysis.portfolio import allocate_portfolio
 
-def get_market_regime(benchmark="^STI"):
+BENCHMARK = "^STI"
+
+# per-ticker work runs on a thread pool; every Yahoo call draws from one shared budget
+SCREEN_WORKERS = 8
+SCREEN_REQUESTS_PER_SECOND = 4.0
+
+# PortfolioScore blend and regime multipliers (tuned with analysis/sweep.py)
+SCORE_WEIGHTS = {
+    "QuantScore": 1.2,
+    "QualScore": 1.0,
+    "CatalystScore": 1.5,
+    "OrderScore": 1.2,
+    "GovScore": 0.5,
+    "AdjValuationScore": 2.0,
+    "TechScore": 1.0,
+}
+BEAR_DIVIDEND_MULT = 1.5
+BEAR_VOL_MULT = 0.8
+CORRELATION_THRESHOLD = 0.80
+
+def get_market_regime(benchmark=BENCHMARK, hist=None):
     try:
-        hist = yf.Ticker(benchmark).history(period="1y")
+        if hist is None:
+            hist = yf.Ticker(benchmark).history(period="1y")
         if len(hist) < 200:
             return "BULL" 
         ma200 = hist['Close'].rolling(window=200).mean().iloc[-1]
@@ -44,7 +69,138 @@ def get_market_regime(benchmark="^STI"):
         print(f"Regime detection failed: {e}")
         return "BULL"
 
-def run_full_screener():
+def screen_ticker(ticker, regime, panel, news, limiter, technicals=None):
+    try:
+        limiter.acquire()
+        # only slow-moving fields are relied on, so .info is served stale-while-revalidate;
+        # liquidity is priced off the panel's last close rather than a session-fresh quote
+        info = get_info(ticker, fields=("averageVolume",))
+        company_name = info.get("longName") or info.get("shortName") or ticker
+        avg_volume = info.get("averageVolume")
+        price = last_close(panel, ticker) or info.get("currentPrice")
+        avg_daily_value = (avg_volume * price) if avg_volume and price else None
+
+        ratios = extract_ratios(info)
+        sector = info.get("sector", "Unknown")
+        gov_score = gov_spend_sensitivity(sector)
+        quant_score = score_quant(ratios, sector)
+        is_turnaround = turnaround_flag(ratios)
+
+        pe = ratios.get("pe")
+        sector_median_pe = get_sector_median_pe(sector)
+        val_score = valuation_score(pe, sector_median_pe)
+        div_yield = info.get("dividendYield")
+        base_div_adj = dividend_adjustment(div_yield)
+        div_adj = base_div_adj
+        
+        if regime == "BEAR":
+            div_adj = div_adj * BEAR_DIVIDEND_MULT 
+            
+        adj_val_score = min(val_score + div_adj, 1.0)
+
+        headlines = news.get(ticker)
+        if headlines is None:
+            limiter.acquire()
+            headlines = get_headlines(ticker)
+        cat_score, cat_triggers = catalyst_score(headlines)
+        order_score, order_signal = order_momentum(headlines)
+        
+        sentiment, event_count = sentiment_score(headlines)
+        qual_score = score_qual(sentiment, event_count)
+
+        if technicals is not None and ticker in technicals.index:
+            # precomputed for the whole universe in one vectorized pass
+            tech = technicals.loc[ticker]
+            tech_score = int(tech["TechScore"])
+            tech_trend = tech["Trend"]
+            tech_rsi = float(tech["RSI"])
+            base_vol_multiplier = float(tech["BaseVolMultiplier"])
+        else:
+            hist = get_ticker_history(panel, ticker)
+            if hist is None:
+                # no panel slice: the two consumers below download their own history
+                limiter.acquire(2)
+            tech_data = get_technical_signals(ticker, hist=hist)
+            tech_score = tech_data["tech_score"]
+            tech_trend = tech_data["trend"]
+            tech_rsi = tech_data["rsi"]
+            base_vol_multiplier = get_volatility_multiplier(ticker, hist=hist)
+        vol_multiplier = base_vol_multiplier
+        
+        if regime == "BEAR":
+            vol_multiplier = vol_multiplier * BEAR_VOL_MULT 
+
+        rules = SECTOR_RULES.get(sector, DEFAULT_RULES)
+        breakdown = factor_breakdown(ratios, rules)
+        flags = risk_flags(ratios)
+        triggers = scenario_triggers(ratios)
+
+        decision_rationale = []
+        if order_score > 0: decision_rationale.append(order_signal)
+        if cat_score >= 3: decision_rationale.append("Strong near-term catalyst")
+        if quant_score >= 3: decision_rationale.append("Solid fundamentals")
+        if qual_score < 0: decision_rationale.append("Negative sentiment risk")
+        if adj_val_score >= 0.8: decision_rationale.append("Attractive valuation vs sector")
+        if div_yield and div_yield >= 0.04: decision_rationale.append("Attractive dividend yield")
+
+        if quant_score >= 4 and qual_score >= 2 and adj_val_score >= 0.5 and tech_score > 0:
+            decision = "CORE LONG"
+        elif cat_score >= 3 and qual_score >= 2:
+            decision = "CATALYST BUY"
+        elif adj_val_score >= 0.8 and (qual_score >= 1 or tech_rsi < 30):
+            decision = "VALUE ACCUMULATE"
+        elif quant_score >= 4:
+            decision = "QUALITY HOLD"
+        elif qual_score <= -2 or (quant_score <= 1 and adj_val_score <= 0.3) or tech_score <= -2:
+            decision = "AVOID / EXIT"
+        else:
+            decision = "NEUTRAL / WATCH"
+
+        return {
+            "CompanyName": company_name,
+            "Ticker": ticker,
+            "Sector": sector,
+            "QuantScore": quant_score,
+            "QualScore": qual_score,
+            "CatalystScore": cat_score,
+            "OrderScore": order_score,
+            "GovScore": gov_score,
+            "ValuationScore": val_score,
+            "AdjValuationScore": adj_val_score,
+            "DividendYield": div_yield,
+            "Decision": decision,
+            "DecisionRationale": "; ".join(decision_rationale) if decision_rationale else "No clear upside drivers",
+            "PassedFactors": ", ".join([k for k, v in breakdown.items() if v == "PASS"]),
+            "RiskFlags": "; ".join(flags),
+            "ScenarioTriggers": "; ".join(triggers),
+            "CatalystTriggers": "; ".join(cat_triggers),
+            "AvgDailyValue": avg_daily_value,
+            "Turnaround": is_turnaround,
+            "TechScore": tech_score,
+            "Trend": tech_trend,
+            "RSI": tech_rsi,
+            "VolMultiplier": vol_multiplier,
+            "QuantWeighted": quant_score * 1.5,
+            "QualWeighted": qual_score,
+            # pre-regime inputs, kept so the blend can be re-scored without refetching
+            "DividendAdj": base_div_adj,
+            "BaseVolMultiplier": base_vol_multiplier
+        }
+
+    except Exception as e:
+        print(f"Error processing {ticker}: {e}")
+        return None
+
+def compute_portfolio_scores(df, weights=SCORE_WEIGHTS):
+    df["PortfolioScore"] = sum(df[col] * w for col, w in weights.items())
+
+    df["DividendTilt"] = df["DividendYield"].fillna(0).clip(upper=0.06)
+    df["AdjPortfolioScore"] = (
+        df["PortfolioScore"] * (1 + df["DividendTilt"]) * df["VolMultiplier"]
+    )
+    return df
+
+def run_full_screener(max_workers=SCREEN_WORKERS, requests_per_second=SCREEN_REQUESTS_PER_SECOND):
     TICKER_FILE = "tickers.txt"
 
     def load_tickers(file):
@@ -55,134 +211,47 @@ def run_full_screener():
             return [line.strip() for line in f if line.strip()]
 
     tickers = load_tickers(TICKER_FILE)
-    results = []
 
-    regime = get_market_regime()
+    # one batched download feeds every price consumer below
+    panel = get_price_panel(tickers + [BENCHMARK], period="1y")
+
+    regime = get_market_regime(hist=get_ticker_history(panel, BENCHMARK))
     print(f"Current Market Regime Detected: {regime}")
     print(f"Starting screening for {len(tickers)} tickers...")
 
-    for ticker in tickers:
-        try:
-            info = get_info(ticker)
-            company_name = info.get("longName") or info.get("shortName") or ticker
-            avg_volume = info.get("averageVolume")
-            price = info.get("currentPrice")
-            avg_daily_value = (avg_volume * price) if avg_volume and price else None
-
-            ratios = extract_ratios(info)
-            sector = info.get("sector", "Unknown")
-            gov_score = gov_spend_sensitivity(sector)
-            quant_score = score_quant(ratios, sector)
-            is_turnaround = turnaround_flag(ratios)
-
-            pe = ratios.get("pe")
-            sector_median_pe = get_sector_median_pe(sector)
-            val_score = valuation_score(pe, sector_median_pe)
-            div_yield = info.get("dividendYield")
-            div_adj = dividend_adjustment(div_yield)
-            
-            if regime == "BEAR":
-                div_adj = div_adj * 1.5 
-                
-            adj_val_score = min(val_score + div_adj, 1.0)
+    # all RSS feeds are pulled concurrently up front; unchanged feeds cost a 304
+    try:
+        news = fetch_all_headlines(tickers)
+    except Exception as e:
+        print(f"Bulk news fetch failed: {e}. Falling back to per-ticker feeds.")
+        news = {}
 
-            headlines = get_headlines(ticker)
-            cat_score, cat_triggers = catalyst_score(headlines)
-            order_score, order_signal = order_momentum(headlines)
-            
-            sentiment, event_count = sentiment_score(headlines)
-            qual_score = score_qual(sentiment, event_count)
+    # MA/RSI/volatility overlay for every ticker with price history; the
+    # persisted indicator state only has to absorb bars added since last run
+    technicals = None
+    if not panel.empty:
+        closes = panel["Close"].reindex(columns=tickers).dropna(axis=1, how="all")
+        indicators = get_indicator_store().refresh(panel.reindex(columns=closes.columns, level=1))
+        technicals = technical_overlay(indicators) if not indicators.empty else None
 
-            tech_data = get_technical_signals(ticker)
-            tech_score = tech_data["tech_score"]
-            tech_trend = tech_data["trend"]
-            tech_rsi = tech_data["rsi"]
-            vol_multiplier = get_volatility_multiplier(ticker)
-            
-            if regime == "BEAR":
-                vol_multiplier = vol_multiplier * 0.8 
-
-            rules = SECTOR_RULES.get(sector, DEFAULT_RULES)
-            breakdown = factor_breakdown(ratios, rules)
-            flags = risk_flags(ratios)
-            triggers = scenario_triggers(ratios)
-
-            decision_rationale = []
-            if order_score > 0: decision_rationale.append(order_signal)
-            if cat_score >= 3: decision_rationale.append("Strong near-term catalyst")
-            if quant_score >= 3: decision_rationale.append("Solid fundamentals")
-            if qual_score < 0: decision_rationale.append("Negative sentiment risk")
-            if adj_val_score >= 0.8: decision_rationale.append("Attractive valuation vs sector")
-            if div_yield and div_yield >= 0.04: decision_rationale.append("Attractive dividend yield")
-
-            if quant_score >= 4 and qual_score >= 2 and adj_val_score >= 0.5 and tech_score > 0:
-                decision = "CORE LONG"
-            elif cat_score >= 3 and qual_score >= 2:
-                decision = "CATALYST BUY"
-            elif adj_val_score >= 0.8 and (qual_score >= 1 or tech_rsi < 30):
-                decision = "VALUE ACCUMULATE"
-            elif quant_score >= 4:
-                decision = "QUALITY HOLD"
-            elif qual_score <= -2 or (quant_score <= 1 and adj_val_score <= 0.3) or tech_score <= -2:
-                decision = "AVOID / EXIT"
-            else:
-                decision = "NEUTRAL / WATCH"
-
-            results.append({
-                "CompanyName": company_name,
-                "Ticker": ticker,
-                "Sector": sector,
-                "QuantScore": quant_score,
-                "QualScore": qual_score,
-                "CatalystScore": cat_score,
-                "OrderScore": order_score,
-                "GovScore": gov_score,
-                "ValuationScore": val_score,
-                "AdjValuationScore": adj_val_score,
-                "DividendYield": div_yield,
-                "Decision": decision,
-                "DecisionRationale": "; ".join(decision_rationale) if decision_rationale else "No clear upside drivers",
-                "PassedFactors": ", ".join([k for k, v in breakdown.items() if v == "PASS"]),
-                "RiskFlags": "; ".join(flags),
-                "ScenarioTriggers": "; ".join(triggers),
-                "CatalystTriggers": "; ".join(cat_triggers),
-                "AvgDailyValue": avg_daily_value,
-                "Turnaround": is_turnaround,
-                "TechScore": tech_score,
-                "Trend": tech_trend,
-                "RSI": tech_rsi,
-                "VolMultiplier": vol_multiplier,
-                "QuantWeighted": quant_score * 1.5,
-                "QualWeighted": qual_score
-            })
-
-            time.sleep(1)
-
-        except Exception as e:
-            print(f"Error processing {ticker}: {e}")
+    limiter = RateLimiter(requests_per_second, burst=max_workers)
 
-    df = pd.DataFrame(results)
+    # executor.map yields in submission order, so rows keep the tickers.txt order
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = pool.map(lambda t: screen_ticker(t, regime, panel, news, limiter, technicals), tickers)
+        results = [row for row in rows if row is not None]
 
-    df["PortfolioScore"] = (
-        df["QuantScore"] * 1.2
-        + df["QualScore"]
-        + df["CatalystScore"] * 1.5
-        + df["OrderScore"] * 1.2
-        + df["GovScore"] * 0.5
-        + df["AdjValuationScore"] * 2
-        + df["TechScore"] * 1.0
-    )
+    df = pd.DataFrame(results)
 
-    df["DividendTilt"] = df["DividendYield"].fillna(0).clip(upper=0.06)
-    df["AdjPortfolioScore"] = (
-        df["PortfolioScore"] * (1 + df["DividendTilt"]) * df["VolMultiplier"]
-    )
+    df = compute_portfolio_scores(df)
 
     df["LiquidityCap"] = df["AvgDailyValue"].apply(liquidity_cap)
-    df["TargetWeight"] = allocate_portfolio(df)
+    prices = panel["Close"] if not panel.empty else None
+    df["TargetWeight"] = allocate_portfolio(df, prices=prices, correlation_threshold=CORRELATION_THRESHOLD)
 
-    df.to_csv("stock_screen_results.csv", index=False)
+    save_screen(df)
     print("Screening Complete. File saved.")
+    return df
 
 if __name__ == "__main__":
     run_full_screener()
\ No newline at end of file
@@ -4,11 +4,12 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 
-def get_technical_signals(ticker):
+def get_technical_signals(ticker, hist=None):
     try:
-        stock = yf.Ticker(ticker)
-        # 1 year of daily price data
-        hist = stock.history(period="1y")
+        if hist is None:
+            stock = yf.Ticker(ticker)
+            # 1 year of daily price data
+            hist = stock.history(period="1y")
         
         # require sufficient data for a 200-day moving average
         if len(hist) < 200:
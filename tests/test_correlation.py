@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("yfinance")
+
+from analysis.correlation import apply_correlation_penalty, penalty_counts, standardized_returns
+
+def legacy_penalty(df, final_weights, threshold, prices):
+    # the nested pairwise loop apply_correlation_penalty replaced
+    returns = prices.pct_change().dropna()
+    corr_matrix = returns.corr()
+    adjusted = final_weights.copy()
+    order = df.sort_values("AdjPortfolioScore", ascending=False).index
+    for i, primary in enumerate(order):
+        for secondary in order[i + 1:]:
+            if corr_matrix.loc[df.loc[primary, "Ticker"], df.loc[secondary, "Ticker"]] > threshold:
+                adjusted.loc[secondary] *= 0.50
+    return adjusted / adjusted.sum() if adjusted.sum() > 0 else adjusted
+
+def clustered_prices(n_tickers=60, n_days=60, seed=3):
+    # a few tight clusters plus independent names and one flat line, so some
+    # names collect several penalties and some none; 60 sessions fit inside
+    # the 90-day window apply_correlation_penalty trims to
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, size=(n_days, 4))
+    cluster = rng.integers(-1, 4, size=n_tickers)
+    noise = rng.normal(0, 0.01, size=(n_days, n_tickers)) * rng.uniform(0.1, 1.5, size=n_tickers)
+    returns = np.where(cluster >= 0, factors[:, cluster.clip(0)], 0.0) + noise
+    returns[:, 0] = 0.0
+    dates = pd.bdate_range("2024-01-01", periods=n_days)
+    tickers = [f"T{i:03d}.SI" for i in range(n_tickers)]
+    return pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=dates, columns=tickers)
+
+def test_penalty_matches_pairwise_loop():
+    prices = clustered_prices()
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({"Ticker": prices.columns, "AdjPortfolioScore": rng.normal(size=len(prices.columns))})
+    weights = pd.Series(rng.uniform(0.5, 1.5, size=len(df)), index=df.index)
+    weights /= weights.sum()
+
+    expected = legacy_penalty(df, weights, 0.80, prices)
+    actual = apply_correlation_penalty(df, weights, 0.80, prices=prices, verbose=False)
+
+    assert (expected < weights).any()
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+def test_blocked_counts_match_one_block():
+    z = standardized_returns(clustered_prices()).to_numpy()
+    full = penalty_counts(z, 0.80, block_size=z.shape[1])
+    for block_size in (1, 7, 16):
+        np.testing.assert_array_equal(penalty_counts(z, 0.80, block_size=block_size), full)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quant.indicators import compute_indicators
+from quant.indicator_state import IndicatorStore
+
+def panel(days=260, tickers=("A", "B", "C", "D"), seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=days)
+    close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (days, len(tickers))), axis=0)),
+                         index=dates, columns=list(tickers))
+    close.iloc[:40, 1] = np.nan          # B lists late
+    close.iloc[100:103, 2] = np.nan      # C has a gap
+    close.iloc[:, 3] = close.iloc[:, 3].where(np.arange(days) >= days - 30)  # D is short
+    spread = pd.DataFrame(rng.uniform(0.005, 0.03, close.shape), index=dates, columns=close.columns)
+    frame = pd.concat({"Close": close, "High": close * (1 + spread), "Low": close * (1 - spread)}, axis=1)
+    frame.columns.names = ["Price", "Ticker"]
+    return frame
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_incremental_steps_match_full_recompute(tmp_path, smoothing):
+    full = panel()
+    store = IndicatorStore(str(tmp_path / "state.db"))
+    store.refresh(full.iloc[:-5], smoothing)
+    # one vectorized step per new row, partly from a reloaded store
+    store.refresh(full.iloc[:-2], smoothing)
+    incremental = IndicatorStore(str(tmp_path / "state.db")).refresh(full, smoothing)
+
+    expected = compute_indicators(full, smoothing)
+    pd.testing.assert_frame_equal(incremental, expected.loc[incremental.index], check_dtype=False,
+                                  check_names=False, rtol=1e-9)
+
+def test_revised_history_is_reseeded(tmp_path):
+    full = panel()
+    store = IndicatorStore(str(tmp_path / "state.db"))
+    store.refresh(full.iloc[:-1])
+
+    # a split halves every past price of A
+    revised = full.copy()
+    revised.loc[:, (slice(None), "A")] = revised.loc[:, (slice(None), "A")] / 2
+    result = store.refresh(revised)
+
+    expected = compute_indicators(revised)
+    assert result.loc["A", "MA200"] == pytest.approx(expected.loc["A", "MA200"], rel=1e-9)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from quant.indicators import compute_indicators, technical_overlay
+
+def panel(days=260, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=days)
+    tickers = ["A", "B", "C", "D"]
+    close = pd.DataFrame(50 * np.exp(np.cumsum(rng.normal(0, 0.025, (days, 4)), axis=0)),
+                         index=dates, columns=tickers)
+    close.iloc[:30, 1] = np.nan        # listed late
+    close.iloc[[90, 91, 150], 2] = np.nan  # gaps mid-history
+    close.iloc[:-120, 3] = np.nan      # too short for MA200
+    spread = pd.DataFrame(rng.uniform(0.005, 0.04, close.shape), index=dates, columns=tickers)
+    frame = pd.concat({"Close": close, "High": close * (1 + spread), "Low": close * (1 - spread)}, axis=1)
+    frame.columns.names = ["Price", "Ticker"]
+    return frame
+
+def wilder_reference(values, window):
+    # Wilder's average as written out by hand: SMA seed, then avg += (x - avg) / window
+    values = list(values)
+    if len(values) < window:
+        return np.nan
+    avg = sum(values[:window]) / window
+    for x in values[window:]:
+        avg += (x - avg) / window
+    return avg
+
+def reference(hist, smoothing):
+    # the per-ticker pandas formulas the vectorized engine replaced
+    close = hist["Close"]
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    tr = pd.concat([hist["High"] - hist["Low"],
+                    (hist["High"] - close.shift()).abs(),
+                    (hist["Low"] - close.shift()).abs()], axis=1).max(axis=1)
+
+    if smoothing == "sma":
+        avg_gain, avg_loss = gain.rolling(14).mean().iloc[-1], loss.rolling(14).mean().iloc[-1]
+        atr = tr.rolling(14).mean().iloc[-1]
+    else:
+        avg_gain, avg_loss = wilder_reference(gain, 14), wilder_reference(loss, 14)
+        atr = wilder_reference(tr, 14)
+    rs = 100 if avg_loss == 0 else avg_gain / avg_loss
+
+    return {
+        "Close": close.iloc[-1],
+        "Bars": len(close),
+        "MA50": close.rolling(50).mean().iloc[-1],
+        "MA200": close.rolling(200).mean().iloc[-1],
+        "RSI14": 100 - (100 / (1 + rs)),
+        "ATR14": atr,
+        "Vol30": close.pct_change().dropna().rolling(30).std().iloc[-1] * np.sqrt(252),
+    }
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_matches_per_ticker_formulas(smoothing):
+    frame = panel()
+    result = compute_indicators(frame, smoothing)
+
+    for ticker in frame["Close"].columns:
+        hist = frame.xs(ticker, axis=1, level=1).dropna(subset=["Close"])
+        expected = pd.Series(reference(hist, smoothing), dtype=float)
+        pd.testing.assert_series_equal(result.loc[ticker].astype(float), expected,
+                                       check_names=False, rtol=1e-9)
+
+def test_overlay_matches_per_ticker_signals():
+    pytest.importorskip("yfinance")
+    from quant.technical import get_technical_signals
+    from analysis.volatility import get_volatility_multiplier
+
+    frame = panel()
+    overlay = technical_overlay(compute_indicators(frame))
+
+    for ticker in frame["Close"].columns:
+        hist = frame.xs(ticker, axis=1, level=1).dropna(subset=["Close"])
+        signals = get_technical_signals(ticker, hist=hist)
+        assert overlay.loc[ticker, "Trend"] == signals["trend"]
+        assert overlay.loc[ticker, "RSI"] == pytest.approx(signals["rsi"])
+        assert overlay.loc[ticker, "TechScore"] == signals["tech_score"]
+        assert overlay.loc[ticker, "BaseVolMultiplier"] == get_volatility_multiplier(ticker, hist=hist)
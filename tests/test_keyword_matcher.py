@@ -0,0 +1,37 @@
+from qual.keyword_matcher import KeywordMatcher
+
+def matcher():
+    return KeywordMatcher([
+        ("order_win", "win"),
+        ("order_win", "contract win"),
+        ("policy", "government"),
+        ("management", "ceo"),
+        ("plan", "plan"),
+    ])
+
+def test_doubled_consonant_folds_back():
+    hits = matcher().match("Firm keeps winning as planned")
+    assert ("order_win", "win") in hits
+    assert ("plan", "plan") in hits
+
+def test_possessive_folds_onto_noun():
+    hits = matcher().match("Government's budget lifts CEO's outlook")
+    assert ("policy", "government") in hits
+    assert ("management", "ceo") in hits
+
+def test_word_boundaries_still_hold():
+    assert matcher().match("A bitter winter for wine") == frozenset()
+
+def test_hyphenated_words_match_their_parts():
+    m = KeywordMatcher([
+        ("policy", "government"), ("earnings", "profit"), ("management", "ceo"),
+        ("order_win", "order"), ("order_win", "contract"), ("order_win", "win"),
+        ("catalyst", "spin-off"),
+    ])
+    assert ("policy", "government") in m.match("Government-linked fund raises stake")
+    assert ("earnings", "profit") in m.match("Profit-taking drags shares lower")
+    assert ("management", "ceo") in m.match("CEO-led review announced")
+    assert ("order_win", "order") in m.match("Strong order-book into 2025")
+    hits = m.match("Yard books contract-win in Qatar")
+    assert {("order_win", "contract"), ("order_win", "win")} <= hits
+    assert ("catalyst", "spin-off") in m.match("Board approves spin-off of logistics arm")
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+from analysis.performance import drawdown_stats
+
+def test_never_underwater_has_no_recovery():
+    stats = drawdown_stats(pd.DataFrame({"up": [0.01, 0.02, 0.0, 0.03]}))
+    assert stats.loc["up", "MaxDrawdown"] == 0
+    assert stats.loc["up", "MaxDrawdownDuration"] == 0
+    assert stats.loc["up", "RecoveryPeriods"] == 0
+
+def test_recovery_counts_periods_from_trough():
+    # peak, two losing periods, then back above the peak on the fourth
+    stats = drawdown_stats(pd.DataFrame({"dip": [0.10, -0.10, -0.10, 0.10, 0.20]}))
+    assert stats.loc["dip", "MaxDrawdown"] < 0
+    assert stats.loc["dip", "RecoveryPeriods"] == 2
+
+def test_unrecovered_drawdown_is_nan():
+    stats = drawdown_stats(pd.DataFrame({"down": [0.05, -0.20, 0.01]}))
+    assert np.isnan(stats.loc["down", "RecoveryPeriods"])
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("yfinance")
+
+from analysis.portfolio import water_fill
+
+def test_capped_weight_flows_without_flattening_conviction():
+    weights = water_fill([10, 1, 1, 1], [0.2] * 4, np.array([0, 0, 1, 1]), 0.3)
+    np.testing.assert_allclose(weights, [0.2, 0.1, 0.15, 0.15])
+
+def test_binding_sector_cap():
+    # sector 0 wants 0.9 of the book but is held to 0.4; the rest fills the others
+    weights = water_fill([5, 4, 3, 2, 1], [0.3] * 5, np.array([0, 0, 1, 1, 2]), 0.4)
+    np.testing.assert_allclose(weights, [2 / 9, 1.6 / 9, 0.24, 0.16, 0.2])
+    assert weights.sum() == pytest.approx(1.0)
+    assert weights[:2].sum() == pytest.approx(0.4)
+
+def test_uncapped_weights_stay_proportional():
+    weights = water_fill([1, 2, 3, 4], [1.0] * 4, np.array([0, 1, 2, 3]), 1.0)
+    np.testing.assert_allclose(weights, [0.1, 0.2, 0.3, 0.4])
+
+def test_unabsorbed_budget_stays_cash():
+    weights = water_fill([10, 1, 0], [0.2, 0.2, 0.2], np.array([0, 1, 1]), 1.0)
+    np.testing.assert_allclose(weights, [0.2, 0.2, 0.0])
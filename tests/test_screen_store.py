@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from quant.screen_store import SCREEN_SCHEMA, load_screen, save_screen, target_weights
+
+def screen():
+    rows = []
+    for ticker, weight in (("D05.SI", 0.6), ("D05", 0.4)):
+        row = {name: None for name in SCREEN_SCHEMA.names}
+        row.update({
+            "CompanyName": ticker, "Ticker": ticker, "Sector": "Financial Services",
+            "QuantScore": 3, "QualScore": 2, "OrderScore": 0, "GovScore": 1, "TechScore": 2,
+            "Decision": "BUY", "Turnaround": False, "TargetWeight": weight,
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def test_feather_round_trip(tmp_path):
+    df = screen()
+    path, csv_path = tmp_path / "screen.feather", tmp_path / "screen.csv"
+    save_screen(df, path=str(path), csv_path=str(csv_path))
+
+    loaded = load_screen(path=str(path), csv_path=str(csv_path))
+    assert list(loaded.columns) == SCREEN_SCHEMA.names
+    assert loaded["Ticker"].tolist() == ["D05.SI", "D05"]
+    assert loaded["QuantScore"].dtype == "int64"
+    # all-None float columns stay numeric nulls rather than strings
+    assert loaded["DividendYield"].dtype == "float64"
+    assert loaded["DividendYield"].isna().all()
+
+def test_weights_keyed_by_full_ticker():
+    weights = target_weights(screen())
+    assert weights == {"D05.SI": 0.6, "D05": 0.4}
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("yfinance")
+
+from execution.symbol_master import SymbolMaster
+
+class TradeClient:
+    def get_contracts(self, symbol, sec_type="STK", currency=None):
+        return [SimpleNamespace(symbol=symbol, currency=currency, exchange=None, contract_id=None)]
+
+class QuoteClient:
+    def __init__(self):
+        self.requested = []
+
+    def get_trade_metas(self, symbols):
+        # bare symbols, no market: "D05" answers with one listing's lot only
+        self.requested.append(list(symbols))
+        lots = {"D05": 1, "00700": 100}
+        return {"symbol": list(symbols), "lot_size": [lots.get(s, 1) for s in symbols]}
+
+def test_cross_listed_symbol_keeps_its_market_lot(tmp_path):
+    quotes = QuoteClient()
+    master = SymbolMaster(str(tmp_path / "symbols.db"))
+    master.prefetch(TradeClient(), ["D05.SI", "D05", "0700.HK"], quotes)
+
+    # D05 is never sent to get_trade_metas, so D05.SI keeps the SGX board lot
+    assert all("D05" not in batch for batch in quotes.requested)
+    assert master.lot_size("D05.SI") == 100
+    assert master.lot_size("D05") == 1
+    assert master.lot_size("0700.HK") == 100
+
+def test_lazy_resolution_uses_remembered_quote_client(tmp_path):
+    quotes = QuoteClient()
+    master = SymbolMaster(str(tmp_path / "symbols.db"))
+    master.prefetch(TradeClient(), [], quotes)
+    master.prefetch(TradeClient(), ["0700.HK"])
+    assert master.lot_size("0700.HK") == 100
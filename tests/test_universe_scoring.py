@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from quant.sector_rules import SECTOR_RULES, DEFAULT_RULES
+from quant.score_quant import score_quant
+from analysis.factor_breakdown import factor_breakdown
+from analysis.risk_flags import risk_flags
+from analysis.scenarios import scenario_triggers
+from analysis.valuation_score import valuation_score
+from analysis.dividend_adjustment import dividend_adjustment
+from analysis.liquidity import liquidity_cap
+from analysis.turnaround import turnaround_flag
+from analysis.gov_exposure import gov_spend_sensitivity
+from analysis.sector_pe import get_sector_median_pe
+from analysis.universe_scoring import score_universe
+
+def ratios_table(rows=2000, seed=11):
+    rng = np.random.default_rng(seed)
+    sectors = list(SECTOR_RULES) + ["Utilities", "Materials", "Unknown", None]
+
+    def column(scale, shift=0.0):
+        values = (rng.normal(0, scale, rows) + shift).round(3).astype(object)
+        # missing and exact-zero ratios exercise the scalar truthiness checks
+        values[rng.random(rows) < 0.1] = None
+        values[rng.random(rows) < 0.05] = 0.0
+        return values
+
+    return pd.DataFrame({
+        "pe": column(15, 20),
+        "roe": column(0.1, 0.1),
+        "debt_to_equity": column(80, 100),
+        "margin": column(0.1, 0.08),
+        "revenue_growth": column(0.1, 0.05),
+        "sector": rng.choice(np.array(sectors, dtype=object), rows),
+        "dividend_yield": column(0.03, 0.03),
+        "avg_daily_value": column(6_000_000, 5_000_000),
+    })
+
+def scalar_row(row):
+    ratios = {k: row[k] for k in ("pe", "roe", "debt_to_equity", "margin", "revenue_growth")}
+    sector = row["sector"] if row["sector"] is not None else "Unknown"
+    breakdown = factor_breakdown(ratios, SECTOR_RULES.get(sector, DEFAULT_RULES))
+    try:
+        turnaround = turnaround_flag(ratios)
+    except TypeError:
+        # the scalar helper raises on a missing ratio; the batch path reports False
+        turnaround = False
+
+    return {
+        "QuantScore": score_quant(ratios, sector),
+        "GovScore": gov_spend_sensitivity(sector),
+        "Turnaround": turnaround,
+        "ValuationScore": valuation_score(ratios["pe"], get_sector_median_pe(sector)),
+        "DividendAdj": dividend_adjustment(row["dividend_yield"]),
+        "LiquidityCap": liquidity_cap(row["avg_daily_value"]),
+        "PassedFactors": ", ".join(k for k, v in breakdown.items() if v == "PASS"),
+        "RiskFlags": "; ".join(risk_flags(ratios)),
+        "ScenarioTriggers": "; ".join(scenario_triggers(ratios)),
+    }
+
+def test_batch_scores_match_scalar_helpers():
+    table = ratios_table()
+    expected = pd.DataFrame([scalar_row(row) for row in table.to_dict("records")], index=table.index)
+
+    numeric = table.astype({c: float for c in table.columns if c != "sector"})
+    result = score_universe(numeric)
+
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)